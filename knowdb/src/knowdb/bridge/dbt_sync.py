@@ -11,7 +11,13 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import List, Optional, Tuple, Union
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - depends on PyYAML build
+    from yaml import SafeLoader as _YamlLoader
 
 
 class AggregationType(str, Enum):
@@ -30,7 +36,40 @@ class DimensionType(str, Enum):
     TEMPORAL = "temporal"
 
 
-@dataclass
+# SQL aggregation keyword -> AggregationType
+_AGGREGATION_MAP = {
+    'SUM': AggregationType.SUM,
+    'COUNT': AggregationType.COUNT,
+    'COUNT_DISTINCT': AggregationType.COUNT_DISTINCT,
+    'AVG': AggregationType.AVG,
+    'AVERAGE': AggregationType.AVG,
+    'MIN': AggregationType.MIN,
+    'MAX': AggregationType.MAX,
+}
+
+# SQL patterns used to pull metrics and dimensions out of model SQL
+_COUNT_DISTINCT_PATTERN = re.compile(
+    r'COUNT\s*\(\s*DISTINCT\s+(\w+)\s*\)\s*(?:as\s+)?(\w+)', re.IGNORECASE
+)
+_AGGREGATION_PATTERN = re.compile(
+    r'(SUM|COUNT|AVG|MIN|MAX)\s*\(\s*(\*|\w+)\s*\)\s*(?:as\s+)?(\w+)', re.IGNORECASE
+)
+_GROUP_BY_PATTERN = re.compile(
+    r'GROUP\s+BY\s+(.+?)(?:HAVING|ORDER|LIMIT|$)', re.IGNORECASE | re.DOTALL
+)
+_SELECT_PATTERN = re.compile(r'SELECT\s+(.+?)\s+FROM', re.IGNORECASE | re.DOTALL)
+_ALIAS_PATTERN = re.compile(r'\s+as\s+(\w+)\s*$', re.IGNORECASE)
+_LEADING_IDENTIFIER_PATTERN = re.compile(r'^(\w+)')
+
+# Column-name fragments that mark a dimension as temporal
+_TEMPORAL_NAME_PATTERNS = (
+    'date', 'time', 'timestamp', 'month', 'year', 'day', 'week',
+    'quarter', 'created', 'updated', 'signup', 'birth', 'order_date',
+    'first_', 'last_'
+)
+
+
+@dataclass(slots=True)
 class DbtColumn:
     """Represents a column in a dbt model."""
     name: str
@@ -39,7 +78,7 @@ class DbtColumn:
     tests: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class DbtModel:
     """Represents a dbt model with its metadata."""
     name: str
@@ -49,7 +88,7 @@ class DbtModel:
     columns: List[DbtColumn] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class MetricDefinition:
     """Definition of a metric extracted from dbt."""
     name: str
@@ -60,7 +99,7 @@ class MetricDefinition:
     aggregation: AggregationType
 
 
-@dataclass
+@dataclass(slots=True)
 class DimensionDefinition:
     """Definition of a dimension extracted from dbt."""
     name: str
@@ -71,7 +110,7 @@ class DimensionDefinition:
     type: DimensionType
 
 
-@dataclass
+@dataclass(slots=True)
 class SyncResult:
     """Result of a sync operation."""
     models_processed: int
@@ -119,11 +158,25 @@ class DbtSemanticBridge:
         Returns:
             List of DbtModel objects
         """
-        models = []
+        return list(self.iter_models(model_path))
+
+    def iter_models(self, model_path: str = "marts") -> Iterator[DbtModel]:
+        """
+        Yield dbt models one at a time as their SQL files are read.
+
+        Unlike discover_models(), only one model's SQL is held at a time, so
+        large projects can be processed without materializing every model.
+
+        Args:
+            model_path: Subdirectory under models/ to search (default: "marts")
+
+        Yields:
+            DbtModel objects
+        """
         models_dir = self.dbt_path / "models" / model_path
 
         if not models_dir.exists():
-            return models
+            return
 
         # Load all schema.yml files in the directory
         schemas = self._load_schemas(models_dir)
@@ -146,16 +199,13 @@ class DbtSemanticBridge:
                 for col in schema_info.get("columns", [])
             ]
 
-            model = DbtModel(
+            yield DbtModel(
                 name=model_name,
                 path=str(sql_file.parent),
                 sql=sql_content,
                 description=description,
                 columns=columns
             )
-            models.append(model)
-
-        return models
 
     def _load_schemas(self, models_dir: Path) -> dict:
         """Load all schema.yml files and build a lookup by model name."""
@@ -166,7 +216,7 @@ class DbtSemanticBridge:
                 continue
 
             try:
-                content = yaml.safe_load(schema_file.read_text())
+                content = yaml.load(schema_file.read_bytes(), Loader=_YamlLoader)
                 if not content or "models" not in content:
                     continue
 
@@ -268,22 +318,14 @@ class DbtSemanticBridge:
         """
         aggregations = []
 
-        # Pattern for standard aggregations: AGG_FUNC(col) as alias
-        patterns = [
-            # COUNT(DISTINCT col) as alias
-            (r'COUNT\s*\(\s*DISTINCT\s+(\w+)\s*\)\s*(?:as\s+)?(\w+)', 'COUNT_DISTINCT'),
-            # SUM/COUNT/AVG/MIN/MAX(col) as alias
-            (r'(SUM|COUNT|AVG|MIN|MAX)\s*\(\s*(\*|\w+)\s*\)\s*(?:as\s+)?(\w+)', None),
-        ]
-
-        # Handle COUNT(DISTINCT)
-        for match in re.finditer(patterns[0][0], sql, re.IGNORECASE):
+        # Handle COUNT(DISTINCT col) as alias
+        for match in _COUNT_DISTINCT_PATTERN.finditer(sql):
             source_col = match.group(1)
             alias = match.group(2)
             aggregations.append((alias, 'COUNT_DISTINCT', source_col))
 
-        # Handle standard aggregations
-        for match in re.finditer(patterns[1][0], sql, re.IGNORECASE):
+        # Handle standard SUM/COUNT/AVG/MIN/MAX(col) as alias
+        for match in _AGGREGATION_PATTERN.finditer(sql):
             agg_type = match.group(1).upper()
             source_col = match.group(2)
             alias = match.group(3)
@@ -294,7 +336,7 @@ class DbtSemanticBridge:
     def _extract_group_by_columns(self, sql: str) -> List[str]:
         """Extract column names from GROUP BY clause."""
         # Find GROUP BY clause
-        match = re.search(r'GROUP\s+BY\s+(.+?)(?:HAVING|ORDER|LIMIT|$)', sql, re.IGNORECASE | re.DOTALL)
+        match = _GROUP_BY_PATTERN.search(sql)
         if not match:
             return []
 
@@ -309,7 +351,7 @@ class DbtSemanticBridge:
             if '.' in part:
                 part = part.split('.')[-1]
             # Remove any remaining SQL keywords or numbers
-            col_match = re.match(r'^(\w+)', part)
+            col_match = _LEADING_IDENTIFIER_PATTERN.match(part)
             if col_match:
                 columns.append(col_match.group(1))
 
@@ -320,38 +362,35 @@ class DbtSemanticBridge:
         columns = []
 
         # Find SELECT ... FROM
-        match = re.search(r'SELECT\s+(.+?)\s+FROM', sql, re.IGNORECASE | re.DOTALL)
+        match = _SELECT_PATTERN.search(sql)
         if not match:
             return columns
 
         select_part = match.group(1)
 
-        # Split by comma (not inside parentheses)
+        # Split by comma (not inside parentheses): split on every comma, then
+        # rejoin pieces while their parentheses are unbalanced
         parts = []
         depth = 0
         current = []
-        for char in select_part:
-            if char == '(':
-                depth += 1
-            elif char == ')':
-                depth -= 1
-            elif char == ',' and depth == 0:
-                parts.append(''.join(current).strip())
+        for piece in select_part.split(','):
+            current.append(piece)
+            depth += piece.count('(') - piece.count(')')
+            if depth == 0:
+                parts.append(','.join(current).strip())
                 current = []
-                continue
-            current.append(char)
         if current:
-            parts.append(''.join(current).strip())
+            parts.append(','.join(current).strip())
 
         for part in parts:
             # Get alias (after AS) or column name
             if ' as ' in part.lower():
-                alias = re.search(r'\s+as\s+(\w+)\s*$', part, re.IGNORECASE)
+                alias = _ALIAS_PATTERN.search(part)
                 if alias:
                     columns.append(alias.group(1))
             else:
                 # Just column name
-                col_match = re.search(r'^(\w+)', part.strip())
+                col_match = _LEADING_IDENTIFIER_PATTERN.match(part.strip())
                 if col_match:
                     columns.append(col_match.group(1))
 
@@ -359,30 +398,13 @@ class DbtSemanticBridge:
 
     def _map_aggregation(self, agg_type: str) -> Optional[AggregationType]:
         """Map SQL aggregation to AggregationType enum."""
-        mapping = {
-            'SUM': AggregationType.SUM,
-            'COUNT': AggregationType.COUNT,
-            'COUNT_DISTINCT': AggregationType.COUNT_DISTINCT,
-            'AVG': AggregationType.AVG,
-            'AVERAGE': AggregationType.AVG,
-            'MIN': AggregationType.MIN,
-            'MAX': AggregationType.MAX,
-        }
-        return mapping.get(agg_type.upper())
+        return _AGGREGATION_MAP.get(agg_type.upper())
 
     def _infer_dimension_type(self, column_name: str) -> DimensionType:
         """Infer dimension type from column name."""
-        # Temporal patterns
-        temporal_patterns = [
-            'date', 'time', 'timestamp', 'month', 'year', 'day', 'week',
-            'quarter', 'created', 'updated', 'signup', 'birth', 'order_date',
-            'first_', 'last_'
-        ]
-
         name_lower = column_name.lower()
-        for pattern in temporal_patterns:
-            if pattern in name_lower:
-                return DimensionType.TEMPORAL
+        if any(pattern in name_lower for pattern in _TEMPORAL_NAME_PATTERNS):
+            return DimensionType.TEMPORAL
 
         return DimensionType.CATEGORICAL
 
@@ -401,12 +423,24 @@ class DbtSemanticBridge:
         Returns:
             YAML string for the semantic layer
         """
+        semantic_model, _ = self._build_semantic_model(models)
+        return self._render_semantic_yaml(semantic_model)
+
+    def _build_semantic_model(self, models: Iterable[DbtModel]) -> Tuple[dict, int]:
+        """
+        Extract metrics and dimensions from every model into one structure.
+
+        Returns:
+            Tuple of (semantic model dict, number of models processed)
+        """
+        models_processed = 0
         all_metrics = []
         all_dimensions = []
         seen_metric_names = set()
         seen_dimension_names = set()
 
         for model in models:
+            models_processed += 1
             metrics = self.extract_metrics(model)
             dimensions = self.extract_dimensions(model)
 
@@ -450,7 +484,10 @@ class DbtSemanticBridge:
             "metrics": all_metrics,
             "dimensions": all_dimensions
         }
+        return semantic_model, models_processed
 
+    def _render_semantic_yaml(self, semantic_model: dict) -> str:
+        """Dump a semantic model structure as YAML with the generated-file header."""
         # Generate YAML with header comment
         header = f"""# Auto-generated from dbt models
 # Generated at: {datetime.utcnow().isoformat()}
@@ -477,19 +514,12 @@ class DbtSemanticBridge:
         Returns:
             SyncResult with counts and timestamp
         """
-        # Discover models
-        models = self.discover_models()
-
-        # Extract all metrics and dimensions for counting
-        total_metrics = 0
-        total_dimensions = 0
-
-        for model in models:
-            total_metrics += len(self.extract_metrics(model))
-            total_dimensions += len(self.extract_dimensions(model))
+        # Stream discovered models through a single extraction pass; counts
+        # come from the same pass
+        semantic_model, models_processed = self._build_semantic_model(self.iter_models())
 
         # Generate and write YAML
-        yaml_content = self.generate_semantic_yaml(models)
+        yaml_content = self._render_semantic_yaml(semantic_model)
 
         # Ensure output directory exists
         self.output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -498,8 +528,8 @@ class DbtSemanticBridge:
         self.output_path.write_text(yaml_content)
 
         return SyncResult(
-            models_processed=len(models),
-            metrics_generated=total_metrics,
-            dimensions_generated=total_dimensions,
+            models_processed=models_processed,
+            metrics_generated=len(semantic_model["metrics"]),
+            dimensions_generated=len(semantic_model["dimensions"]),
             timestamp=datetime.utcnow()
         )
@@ -5,7 +5,11 @@ Use sbdk commands for data pipelines: sbdk run, sbdk query, sbdk test
 Use knowdb commands for semantic analysis: knowdb analyze, knowdb sync
 """
 
+import atexit
+import csv
 import json
+import sys
+from operator import itemgetter
 from pathlib import Path
 from typing import Optional
 
@@ -13,6 +17,13 @@ import typer
 from rich.console import Console
 from rich.table import Table
 
+# orjson is an optional speedup for JSON output
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Import from sbdk-dev
 try:
     from sbdk.cli import app as sbdk_app
@@ -41,6 +52,14 @@ _semantic_layer: Optional[SemanticLayerManager] = None
 _tools: Optional[SemanticTools] = None
 
 
+def _to_json(obj) -> str:
+    """Serialize CLI output as indented JSON, using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        options = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        return orjson.dumps(obj, default=str, option=options).decode()
+    return json.dumps(obj, indent=2, default=str)
+
+
 def get_semantic_layer() -> SemanticLayerManager:
     """Get or create semantic layer instance."""
     global _semantic_layer
@@ -51,6 +70,7 @@ def get_semantic_layer() -> SemanticLayerManager:
             console.print("Run 'knowdb sync' to generate from dbt models")
             raise typer.Exit(1)
         _semantic_layer = SemanticLayerManager(str(config_path))
+        atexit.register(_semantic_layer.close)
     return _semantic_layer
 
 
@@ -109,23 +129,27 @@ def query(
 
     # Format output
     if format == "json":
-        console.print(json.dumps(result, indent=2, default=str))
+        console.print(_to_json(result))
     elif format == "csv":
-        data = result.get("result", [])
+        data = result.get("result", {}).get("data", [])
         if data:
-            import csv
-            import sys
             writer = csv.DictWriter(sys.stdout, fieldnames=data[0].keys())
             writer.writeheader()
             writer.writerows(data)
     else:  # table
-        data = result.get("result", [])
+        data = result.get("result", {}).get("data", [])
         if data:
             table = Table(title=f"Metric: {metric}")
-            for key in data[0].keys():
+            columns = list(data[0].keys())
+            for key in columns:
                 table.add_column(key)
-            for row in data:
-                table.add_row(*[str(v) for v in row.values()])
+            if len(columns) == 1:
+                for row in data:
+                    table.add_row(str(row[columns[0]]))
+            else:
+                get_values = itemgetter(*columns)
+                for row in data:
+                    table.add_row(*map(str, get_values(row)))
             console.print(table)
 
         # Show statistics if requested
@@ -146,7 +170,7 @@ def list_metrics(
     metrics = tools.list_metrics()
 
     if format == "json":
-        console.print(json.dumps(metrics, indent=2))
+        console.print(_to_json(metrics))
     else:
         table = Table(title="Available Metrics")
         table.add_column("Name")
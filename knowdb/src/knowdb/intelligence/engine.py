@@ -5,15 +5,17 @@ Generates natural language interpretations, analysis suggestions, and insights
 based on query results. Implements execution-first pattern to prevent fabrication.
 """
 
+from collections import deque
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, List, Optional
 
 
 class IntelligenceEngine:
     """Generates natural language interpretations and analysis suggestions."""
 
     def __init__(self):
-        self.context_history: List[Dict[str, Any]] = []
+        # Last 10 interactions; older entries drop off as new ones arrive
+        self.context_history: Deque[Dict[str, Any]] = deque(maxlen=10)
         self.business_benchmarks: Dict[str, Any] = {}
 
     async def generate_interpretation(
@@ -593,7 +595,3 @@ class IntelligenceEngine:
         """Add context to the conversation history."""
         context["timestamp"] = datetime.now().isoformat()
         self.context_history.append(context)
-
-        # Keep only last 10 interactions
-        if len(self.context_history) > 10:
-            self.context_history = self.context_history[-10:]
@@ -18,18 +18,36 @@ warnings.filterwarnings("ignore")
 class StatisticalTester:
     """Handles statistical testing and validation for query results."""
 
+    # Comparison type -> handler method name, resolved per call so that
+    # instance-level overrides (e.g. in tests) are honoured
+    _COMPARISON_HANDLERS = {
+        "groups": "auto_test_comparison",
+        "correlation": "_correlation_test",
+        "trend": "_trend_test",
+    }
+
     def __init__(self):
         self.min_sample_size = 30
         self.warning_threshold = 100
         self.default_alpha = 0.05
 
     async def validate_result(
-        self, result: Dict[str, Any], dimensions: List[str]
+        self,
+        result: Dict[str, Any],
+        dimensions: List[str],
+        frame: Optional[pd.DataFrame] = None,
     ) -> Dict[str, Any]:
         """
         Validate query results for statistical reliability.
 
         Checks sample sizes, data quality, and provides warnings.
+
+        Args:
+            result: Query result with a ``data`` list of rows
+            dimensions: Grouping dimensions of the query
+            frame: ``result["data"]`` already converted to a DataFrame, so a
+                caller running several checks converts it only once; it is
+                read, never modified
         """
 
         validation = {
@@ -46,7 +64,7 @@ class StatisticalTester:
             return validation
 
         # Convert to DataFrame for easier analysis
-        df = pd.DataFrame(data)
+        df = frame if frame is not None else pd.DataFrame(data)
 
         # Check overall sample size
         total_rows = len(df)
@@ -81,36 +99,41 @@ class StatisticalTester:
                         "Highly unbalanced groups - interpret comparisons carefully"
                     )
 
-        # Check for missing values
-        for col in df.columns:
-            missing_count = df[col].isna().sum()
-            if missing_count > 0:
-                missing_pct = (missing_count / len(df)) * 100
-                validation["data_quality"][col] = {
-                    "missing_count": int(missing_count),
-                    "missing_percent": round(missing_pct, 1),
-                }
-                if missing_pct > 10:
-                    validation["warnings"].append(
-                        f"High missing data: {col} ({missing_pct:.1f}% missing)"
-                    )
+        # Check for missing values (counted for all columns in one pass)
+        missing_counts = df.isna().sum()
+        for col, missing_count in missing_counts[missing_counts > 0].items():
+            missing_pct = (missing_count / total_rows) * 100
+            validation["data_quality"][col] = {
+                "missing_count": int(missing_count),
+                "missing_percent": round(missing_pct, 1),
+            }
+            if missing_pct > 10:
+                validation["warnings"].append(
+                    f"High missing data: {col} ({missing_pct:.1f}% missing)"
+                )
 
         return validation
 
     async def auto_test_comparison(
-        self, result: Dict[str, Any], dimensions: List[str], measures: List[str]
+        self,
+        result: Dict[str, Any],
+        dimensions: List[str],
+        measures: List[str],
+        frame: Optional[pd.DataFrame] = None,
     ) -> Optional[Dict[str, Any]]:
         """
         Automatically run appropriate statistical tests when comparing groups.
 
         Determines test type based on data structure and runs significance testing.
+        ``frame`` is an optional pre-built DataFrame of ``result["data"]``, as
+        in validate_result().
         """
 
         data = result.get("data", [])
         if not data or not dimensions or not measures:
             return None
 
-        df = pd.DataFrame(data)
+        df = frame if frame is not None else pd.DataFrame(data)
         dim = dimensions[0]
         measure = measures[0]
 
@@ -123,9 +146,9 @@ class StatisticalTester:
         if len(clean_df) < self.min_sample_size:
             return None
 
-        # Get unique groups
-        groups = clean_df[dim].unique()
-        if len(groups) < 2:
+        # Partition measure values by group in one pass (first-seen order)
+        grouped = clean_df.groupby(dim, sort=False)[measure]
+        if grouped.ngroups < 2:
             return None  # Need at least 2 groups to compare
 
         # Extract values for each group
@@ -133,8 +156,8 @@ class StatisticalTester:
         group_names = []
         sample_sizes = {}
 
-        for group in groups:
-            group_values = clean_df[clean_df[dim] == group][measure].values
+        for group, series in grouped:
+            group_values = series.to_numpy(dtype=float)
             if len(group_values) >= 5:  # Minimum group size
                 group_data.append(group_values)
                 group_names.append(str(group))
@@ -165,12 +188,13 @@ class StatisticalTester:
     ) -> Dict[str, Any]:
         """Run appropriate test for two groups."""
 
-        # Check normality with Shapiro-Wilk (if sample size allows)
+        # Check normality with Shapiro-Wilk (if sample size allows); only
+        # both groups being normal matters, so skip group2 once group1 fails
         normal1 = normal2 = True
         if len(group1) <= 5000:
             _, p1 = stats.shapiro(group1)
             normal1 = p1 > 0.05
-        if len(group2) <= 5000:
+        if normal1 and len(group2) <= 5000:
             _, p2 = stats.shapiro(group2)
             normal2 = p2 > 0.05
 
@@ -300,15 +324,12 @@ class StatisticalTester:
         if measures is None:
             measures = []
 
-        if comparison_type == "groups":
-            return await self.auto_test_comparison(data, dimensions, measures)
-        elif comparison_type == "correlation":
-            return await self._correlation_test(data, dimensions, measures)
-        elif comparison_type == "trend":
-            return await self._trend_test(data, dimensions, measures)
-        else:
+        handler_name = self._COMPARISON_HANDLERS.get(comparison_type)
+        if handler_name is None:
             return {"error": f"Unknown comparison type: {comparison_type}"}
 
+        return await getattr(self, handler_name)(data, dimensions, measures)
+
     async def _correlation_test(
         self, data: Dict[str, Any], dimensions: List[str], measures: List[str]
     ) -> Optional[Dict[str, Any]]:
@@ -317,18 +338,19 @@ class StatisticalTester:
         if len(measures) < 2:
             return None
 
-        df = pd.DataFrame(data.get("data", []))
         var1, var2 = measures[0], measures[1]
 
-        if var1 not in df.columns or var2 not in df.columns:
-            return None
+        # Only materialize the two columns under test; absent columns come
+        # back all-NaN and are dropped below
+        df = pd.DataFrame(data.get("data", []), columns=[var1, var2])
 
         # Remove missing values
-        clean_df = df[[var1, var2]].dropna()
+        clean_df = df.dropna()
         if len(clean_df) < self.min_sample_size:
             return None
 
-        x, y = clean_df[var1].values, clean_df[var2].values
+        x = clean_df[var1].to_numpy(dtype=float)
+        y = clean_df[var2].to_numpy(dtype=float)
 
         # Pearson correlation
         r_pearson, p_pearson = stats.pearsonr(x, y)
@@ -355,11 +377,11 @@ class StatisticalTester:
         if not dimensions or not measures:
             return None
 
-        df = pd.DataFrame(data.get("data", []))
         time_var, measure_var = dimensions[0], measures[0]
 
-        if time_var not in df.columns or measure_var not in df.columns:
-            return None
+        # Only materialize the columns under test; absent columns come back
+        # all-NaN and are dropped below
+        df = pd.DataFrame(data.get("data", []), columns=[time_var, measure_var])
 
         # Sort by time variable
         df_sorted = df.sort_values(time_var).dropna(subset=[time_var, measure_var])
@@ -368,7 +390,7 @@ class StatisticalTester:
 
         # Create time index for regression
         time_index = np.arange(len(df_sorted))
-        values = df_sorted[measure_var].values
+        values = df_sorted[measure_var].to_numpy(dtype=float)
 
         # Linear regression for trend
         slope, intercept, r_value, p_value, std_err = stats.linregress(
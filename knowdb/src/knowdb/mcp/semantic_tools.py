@@ -13,6 +13,9 @@ from typing import Any, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Dimension names that already make a query a time-series breakdown
+_TEMPORAL_DIMENSIONS = frozenset({"month", "quarter", "year"})
+
 
 class SemanticTools:
     """
@@ -333,7 +336,7 @@ class SemanticTools:
             })
 
         # Suggest trend analysis if not temporal
-        if dimensions and not any(d in ["month", "quarter", "year"] for d in dimensions):
+        if dimensions and _TEMPORAL_DIMENSIONS.isdisjoint(dimensions):
             suggestions.append({
                 "question": f"What is the trend of {metric} over time?",
                 "query": {
@@ -8,6 +8,7 @@ Implements execution-first pattern to prevent fabrication.
 import asyncio
 import logging
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -43,54 +44,60 @@ _query_optimizer = None
 _model_discovery = None
 
 
+# Tool definitions are static, so build them once at import time
+_TOOL_LIST: List[Dict[str, Any]] = [
+    {
+        "name": "query_model",
+        "description": (
+            "Query a semantic model with execution-first pattern. "
+            "Returns data with statistical analysis and interpretation."
+        ),
+    },
+    {
+        "name": "list_models",
+        "description": "List available semantic models with descriptions.",
+    },
+    {
+        "name": "get_model",
+        "description": "Get detailed schema for a specific model.",
+    },
+    {
+        "name": "discover_models",
+        "description": "Discover relevant models for a natural language question using RAG.",
+    },
+    {
+        "name": "suggest_analysis",
+        "description": "Suggest next analysis steps based on current results.",
+    },
+    {
+        "name": "test_significance",
+        "description": "Run statistical significance tests on data.",
+    },
+    {
+        "name": "health_check",
+        "description": "Check system health and database connections.",
+    },
+    {
+        "name": "sample_queries",
+        "description": "Get sample queries for a model to get started.",
+    },
+    {
+        "name": "optimize_query",
+        "description": "Get query optimization recommendations.",
+    },
+]
+
+
 def get_tool_list() -> List[Dict[str, Any]]:
     """
     Get list of available MCP tools.
 
+    The same list object is returned on every call and must not be mutated.
+
     Returns:
         List of tool definitions
     """
-    return [
-        {
-            "name": "query_model",
-            "description": (
-                "Query a semantic model with execution-first pattern. "
-                "Returns data with statistical analysis and interpretation."
-            ),
-        },
-        {
-            "name": "list_models",
-            "description": "List available semantic models with descriptions.",
-        },
-        {
-            "name": "get_model",
-            "description": "Get detailed schema for a specific model.",
-        },
-        {
-            "name": "discover_models",
-            "description": "Discover relevant models for a natural language question using RAG.",
-        },
-        {
-            "name": "suggest_analysis",
-            "description": "Suggest next analysis steps based on current results.",
-        },
-        {
-            "name": "test_significance",
-            "description": "Run statistical significance tests on data.",
-        },
-        {
-            "name": "health_check",
-            "description": "Check system health and database connections.",
-        },
-        {
-            "name": "sample_queries",
-            "description": "Get sample queries for a model to get started.",
-        },
-        {
-            "name": "optimize_query",
-            "description": "Get query optimization recommendations.",
-        },
-    ]
+    return _TOOL_LIST
 
 
 def create_mcp_server(
@@ -363,6 +370,27 @@ async def initialize_components():
         raise
 
 
+def warm_up_components(timeout: float = 30.0):
+    """
+    Warm up the semantic layer so the first tool call doesn't pay cold-start costs.
+
+    Runs on the calling thread before the server starts, so nothing is left
+    querying the shared connection once requests arrive. Metrics not reached
+    within ``timeout`` seconds are skipped. Failures are logged and never
+    prevent the server from starting.
+
+    Args:
+        timeout: Seconds after which remaining warm-up queries are skipped
+    """
+    if _semantic_manager is None or not hasattr(_semantic_manager, "warm_up"):
+        return
+
+    try:
+        _semantic_manager.warm_up(deadline=time.monotonic() + timeout)
+    except Exception as e:
+        logger.warning(f"Warm-up failed: {e}")
+
+
 def main():
     """Main entry point for the MCP server."""
     # Startup messages to stderr to avoid MCP protocol interference
@@ -374,6 +402,7 @@ def main():
 
     # Initialize components
     asyncio.run(initialize_components())
+    warm_up_components()
 
     # Create and run server
     mcp = create_mcp_server(
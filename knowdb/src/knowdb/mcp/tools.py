@@ -5,11 +5,22 @@ Implements execution-first pattern: Build -> Execute -> Annotate
 All tools execute queries BEFORE generating interpretations to prevent fabrication.
 """
 
+import asyncio
 import json
 import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+import pandas as pd
+
+# orjson is an optional speedup; fall back to the stdlib parser
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
 
@@ -45,6 +56,7 @@ async def query_model_tool(
     Returns:
         Query results with interpretation and suggestions
     """
+    cache_write = None
     try:
         # 1. BUILD: Generate query
         query_info = await semantic_manager.build_query(
@@ -68,19 +80,25 @@ async def query_model_tool(
                 query_info, conversation_memory
             )
             result = await semantic_manager.execute_query(optimized_query)
-
-            # Cache the result
-            query_optimizer.cache_result(query_key, result, query_info)
             result["cache_hit"] = False
 
+            # Cache the result in a worker thread while the analysis runs
+            cache_write = asyncio.create_task(
+                asyncio.to_thread(query_optimizer.cache_result, query_key, result, query_info)
+            )
+
         # 4. VALIDATE: Check data quality
-        validation = await statistical_tester.validate_result(result, dimensions)
+        # Validation and the comparison test share one DataFrame of the rows
+        frame = pd.DataFrame(result.get("data", []))
+        validation = await statistical_tester.validate_result(
+            result, dimensions, frame=frame
+        )
 
         # 5. ANALYZE: Run statistical tests if comparing groups
         statistical_analysis = None
-        if len(dimensions) > 0 and len(result.get("data", [])) > 1:
+        if len(dimensions) > 0 and len(frame) > 1:
             statistical_analysis = await statistical_tester.auto_test_comparison(
-                result, dimensions, measures
+                result, dimensions, measures, frame=frame
             )
 
         # 6. ANNOTATE: Generate interpretation based on REAL data
@@ -167,6 +185,15 @@ async def query_model_tool(
             },
         }
 
+    finally:
+        # The background cache write never outlives the call, whether the
+        # analysis succeeded or not, and its own failure is only logged
+        if cache_write is not None:
+            try:
+                await cache_write
+            except Exception as e:
+                logger.warning(f"Failed to cache result for model '{model}': {e}")
+
 
 async def list_models_tool(semantic_manager) -> Dict[str, Any]:
     """
@@ -288,7 +315,7 @@ async def suggest_analysis_tool(
         parsed_result = None
         if current_result:
             try:
-                parsed_result = json.loads(current_result)
+                parsed_result = _json_loads(current_result)
             except json.JSONDecodeError:
                 context = current_result
 
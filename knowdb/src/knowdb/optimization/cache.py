@@ -9,6 +9,7 @@ Features:
 - Tag-based invalidation
 - Pattern-based invalidation
 - Cache key normalization
+- Batched get_many/set_many lookups
 
 Target: 95%+ cache hit rate for production workloads.
 """
@@ -21,13 +22,16 @@ import threading
 import time
 from collections import OrderedDict
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime
 from enum import Enum
-from functools import wraps
-from typing import Any, Callable, Dict, List, Optional, Set
+from functools import lru_cache, wraps
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Serialized form of "no parameters", identical to json.dumps({})
+_EMPTY_PARAMS = b"{}"
+
 
 class CacheBackend(Enum):
     """Available cache backends."""
@@ -36,7 +40,7 @@ class CacheBackend(Enum):
     FILE = "file"
 
 
-@dataclass
+@dataclass(slots=True)
 class CacheConfig:
     """Configuration for QueryCache.
 
@@ -61,38 +65,37 @@ class CacheConfig:
             raise ValueError("ttl_seconds must be non-negative")
 
 
-@dataclass
+@dataclass(slots=True)
 class CacheEntry:
     """Individual cache entry with metadata.
 
     Attributes:
         value: Cached data
-        created_at: When entry was created
-        expires_at: When entry expires
+        created_at: When entry was created, as a unix timestamp
+        expires_at: When entry expires, as a unix timestamp
         key: Cache key (hashed)
         access_count: Number of times accessed
         tags: Optional tags for invalidation
         original_key: Original key before hashing
     """
     value: Any
-    created_at: datetime
-    expires_at: datetime
+    created_at: float
+    expires_at: float
     key: str
     access_count: int = 0
     tags: List[str] = field(default_factory=list)
     original_key: str = ""
-
     @property
     def is_expired(self) -> bool:
         """Check if entry has expired."""
-        return datetime.now() > self.expires_at
+        return time.time() > self.expires_at
 
     def to_dict(self) -> Dict[str, Any]:
         """Serialize entry to dictionary."""
         return {
             "value": self.value,
-            "created_at": self.created_at.isoformat(),
-            "expires_at": self.expires_at.isoformat(),
+            "created_at": datetime.fromtimestamp(self.created_at).isoformat(),
+            "expires_at": datetime.fromtimestamp(self.expires_at).isoformat(),
             "key": self.key,
             "access_count": self.access_count,
             "tags": self.tags,
@@ -104,8 +107,8 @@ class CacheEntry:
         """Deserialize entry from dictionary."""
         return cls(
             value=data["value"],
-            created_at=datetime.fromisoformat(data["created_at"]),
-            expires_at=datetime.fromisoformat(data["expires_at"]),
+            created_at=datetime.fromisoformat(data["created_at"]).timestamp(),
+            expires_at=datetime.fromisoformat(data["expires_at"]).timestamp(),
             key=data["key"],
             access_count=data.get("access_count", 0),
             tags=data.get("tags", []),
@@ -113,7 +116,7 @@ class CacheEntry:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class CacheMetrics:
     """Cache performance metrics.
 
@@ -130,6 +133,20 @@ class CacheMetrics:
     last_reset: datetime = field(default_factory=datetime.now)
 
 
+@lru_cache(maxsize=4096)
+def _hash_query(query: str, params_bytes: bytes) -> str:
+    """Normalize and hash a query, memoized so repeated queries hash once."""
+    # Normalize query: lowercase, single spaces
+    normalized = " ".join(query.lower().split())
+
+    # Hash the parts incrementally rather than building one joined string
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(normalized.encode())
+    digest.update(b"|")
+    digest.update(params_bytes)
+    return digest.hexdigest()
+
+
 class QueryCache:
     """
     Production-ready query cache with LRU eviction and TTL support.
@@ -153,7 +170,8 @@ class QueryCache:
         self.config = config or CacheConfig()
         self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
         self._metrics = CacheMetrics()
-        self._lock = threading.RLock()
+        # Plain Lock: no method takes the lock while already holding it
+        self._lock = threading.Lock()
         self._tag_index: Dict[str, Set[str]] = {}  # tag -> set of keys
 
         logger.info(f"QueryCache initialized: max_size={self.config.max_size}, "
@@ -169,21 +187,21 @@ class QueryCache:
             params: Optional query parameters
 
         Returns:
-            SHA256 hash of normalized query and params
+            128-bit BLAKE2b hex digest of normalized query and params
         """
-        # Normalize query: lowercase, single spaces
-        normalized = " ".join(query.lower().split())
-
-        # Include sorted params in hash
-        params_str = json.dumps(params or {}, sort_keys=True)
-
-        content = f"{normalized}|{params_str}"
-        return hashlib.sha256(content.encode()).hexdigest()[:32]
+        # Include sorted params in hash; most lookups have none, so skip
+        # serializing an empty dict
+        params_bytes = (
+            json.dumps(params, sort_keys=True).encode() if params else _EMPTY_PARAMS
+        )
+        return _hash_query(query, params_bytes)
 
     def get(self, key: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
         """Get cached value by key.
 
         Updates LRU order on access. Returns None for misses or expired entries.
+        Hits return the stored object itself rather than a copy, so callers
+        must treat cached values as read-only.
 
         Args:
             key: Query string or cache key
@@ -195,34 +213,24 @@ class QueryCache:
         cache_key = self._generate_key(key, params)
 
         with self._lock:
-            if self.config.enable_metrics:
-                self._metrics.total_queries += 1
-
-            if cache_key in self._cache:
-                entry = self._cache[cache_key]
+            return self._lookup(cache_key, time.time())
 
-                # Check expiration
-                if entry.is_expired:
-                    self._remove_entry(cache_key)
-                    if self.config.enable_metrics:
-                        self._metrics.misses += 1
-                    return None
+    def get_many(
+        self, items: List[Tuple[str, Optional[Dict[str, Any]]]]
+    ) -> List[Optional[Any]]:
+        """Get several cached values under a single lock acquisition.
 
-                # Update LRU order
-                self._cache.move_to_end(cache_key)
-                entry.access_count += 1
-
-                if self.config.enable_metrics:
-                    self._metrics.hits += 1
-
-                logger.debug(f"Cache HIT: {cache_key[:8]}...")
-                return entry.value
+        Args:
+            items: (query, params) pairs to look up
 
-            if self.config.enable_metrics:
-                self._metrics.misses += 1
+        Returns:
+            Cached value or None for each item, in order
+        """
+        cache_keys = [self._generate_key(key, params) for key, params in items]
 
-            logger.debug(f"Cache MISS: {cache_key[:8]}...")
-            return None
+        with self._lock:
+            now = time.time()
+            return [self._lookup(cache_key, now) for cache_key in cache_keys]
 
     def set(
         self,
@@ -250,38 +258,134 @@ class QueryCache:
         ttl_seconds = ttl if ttl is not None else self.config.ttl_seconds
 
         with self._lock:
-            # Remove if exists (for update)
-            if cache_key in self._cache:
-                self._remove_entry(cache_key)
+            self._store(cache_key, key, value, time.time(), ttl_seconds, tags)
+            return True
 
-            # Evict LRU entries if at capacity
-            while len(self._cache) >= self.config.max_size:
-                self._evict_lru()
-
-            # Create entry
-            now = datetime.now()
-            entry = CacheEntry(
-                value=value,
-                created_at=now,
-                expires_at=now + timedelta(seconds=ttl_seconds),
-                key=cache_key,
-                access_count=0,
-                tags=tags or [],
-                original_key=key,
-            )
-
-            # Add to cache
-            self._cache[cache_key] = entry
-
-            # Update tag index
-            for tag in entry.tags:
-                if tag not in self._tag_index:
-                    self._tag_index[tag] = set()
-                self._tag_index[tag].add(cache_key)
+    def set_many(
+        self,
+        items: List[Tuple[str, Any, Optional[Dict[str, Any]]]],
+        ttl: Optional[int] = None,
+        tags: Optional[List[str]] = None,
+    ) -> bool:
+        """Set several cache entries under a single lock acquisition.
+
+        Args:
+            items: (query, value, params) triples to cache
+            ttl: Optional custom TTL in seconds, applied to every entry
+            tags: Optional tags for invalidation, applied to every entry
 
-            logger.debug(f"Cached: {cache_key[:8]}... (TTL: {ttl_seconds}s)")
+        Returns:
+            True if cached successfully
+        """
+        cache_keys = [self._generate_key(key, params) for key, _, params in items]
+        ttl_seconds = ttl if ttl is not None else self.config.ttl_seconds
+
+        with self._lock:
+            now = time.time()
+            for cache_key, (key, value, _) in zip(cache_keys, items):
+                self._store(cache_key, key, value, now, ttl_seconds, tags)
             return True
 
+    def _lookup(self, cache_key: str, now: float) -> Optional[Any]:
+        """Look up an entry and record hit/miss metrics. Caller holds the lock.
+
+        Args:
+            cache_key: Hashed cache key
+            now: Current unix timestamp
+
+        Returns:
+            Cached value or None
+        """
+        # Resolve the metrics target once; None when tracking is disabled
+        metrics = self._metrics if self.config.enable_metrics else None
+        if metrics is not None:
+            metrics.total_queries += 1
+
+        entry = self._cache.get(cache_key)
+        if entry is not None and now <= entry.expires_at:  # inlined is_expired
+            # Update LRU order
+            self._cache.move_to_end(cache_key)
+            entry.access_count += 1
+
+            if metrics is not None:
+                metrics.hits += 1
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Cache HIT: {cache_key[:8]}...")
+            return entry.value
+
+        if entry is not None:
+            # Expired
+            self._remove_entry(cache_key)
+        if metrics is not None:
+            metrics.misses += 1
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Cache MISS: {cache_key[:8]}...")
+        return None
+
+    def _peek(self, cache_key: str) -> Optional[Any]:
+        """Return a live entry's value without touching LRU order or metrics.
+
+        Args:
+            cache_key: Hashed cache key
+
+        Returns:
+            Cached value or None
+        """
+        with self._lock:
+            entry = self._cache.get(cache_key)
+            if entry is not None and time.time() <= entry.expires_at:
+                return entry.value
+            return None
+
+    def _store(
+        self,
+        cache_key: str,
+        key: str,
+        value: Any,
+        now: float,
+        ttl_seconds: int,
+        tags: Optional[List[str]],
+    ) -> None:
+        """Insert an entry, evicting LRU entries at capacity. Caller holds the lock.
+
+        Args:
+            cache_key: Hashed cache key
+            key: Original query string or cache key
+            value: Value to cache
+            now: Creation time for the entry, as a unix timestamp
+            ttl_seconds: Time-to-live in seconds
+            tags: Optional tags for invalidation
+        """
+        # Remove if exists (for update)
+        if cache_key in self._cache:
+            self._remove_entry(cache_key)
+
+        # Evict LRU entries if at capacity
+        while len(self._cache) >= self.config.max_size:
+            self._evict_lru()
+
+        # Create entry
+        entry = CacheEntry(
+            value=value,
+            created_at=now,
+            expires_at=now + ttl_seconds,
+            key=cache_key,
+            access_count=0,
+            tags=list(tags) if tags else [],
+            original_key=key,
+        )
+
+        # Add to cache
+        self._cache[cache_key] = entry
+
+        # Update tag index
+        for tag in entry.tags:
+            if tag not in self._tag_index:
+                self._tag_index[tag] = set()
+            self._tag_index[tag].add(cache_key)
+
+        logger.debug(f"Cached: {cache_key[:8]}... (TTL: {ttl_seconds}s)")
+
     def delete(self, key: str, params: Optional[Dict[str, Any]] = None) -> bool:
         """Delete cache entry by key.
 
@@ -429,17 +533,37 @@ class QueryCache:
             }
 
 
+@dataclass(slots=True)
+class _InFlightCall:
+    """A cached_query computation that concurrent callers can wait on.
+
+    Attributes:
+        done: Set once the leader has finished, successfully or not
+        result: The leader's result, valid when succeeded is True
+        succeeded: Whether the leader returned rather than raised
+    """
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Any = None
+    succeeded: bool = False
+
+
 def cached_query(
     cache: QueryCache,
     ttl: Optional[int] = None,
     tags: Optional[List[str]] = None,
+    wait_timeout: float = 30.0,
 ) -> Callable:
     """Decorator to cache query function results.
 
+    Concurrent misses on the same query are single-flighted: one caller
+    computes the result and the others wait up to ``wait_timeout`` seconds
+    for it before computing it themselves.
+
     Args:
         cache: QueryCache instance
         ttl: Optional custom TTL
         tags: Optional tags for invalidation
+        wait_timeout: Seconds to wait for another caller's computation
 
     Returns:
         Decorated function
@@ -451,6 +575,9 @@ def cached_query(
         ...     return execute_query(query)
     """
     def decorator(func: Callable) -> Callable:
+        in_flight: Dict[str, _InFlightCall] = {}
+        in_flight_lock = threading.Lock()
+
         @wraps(func)
         def wrapper(query: str, *args, **kwargs) -> Any:
             # Check cache first
@@ -458,12 +585,38 @@ def cached_query(
             if result is not None:
                 return result
 
-            # Execute function
-            result = func(query, *args, **kwargs)
-
-            # Cache result
-            cache.set(query, result, ttl=ttl, tags=tags)
-
-            return result
+            cache_key = cache._generate_key(query)
+            while True:
+                with in_flight_lock:
+                    pending = in_flight.get(cache_key)
+                    if pending is None:
+                        call = in_flight[cache_key] = _InFlightCall()
+                if pending is None:
+                    break
+                if not pending.done.wait(wait_timeout):
+                    logger.warning(
+                        f"Waited {wait_timeout}s for in-flight query {cache_key[:8]}..., "
+                        "computing it directly"
+                    )
+                    result = func(query, *args, **kwargs)
+                    cache.set(query, result, ttl=ttl, tags=tags)
+                    return result
+                if pending.succeeded:
+                    return pending.result
+                # The leader raised; contend to compute it once more
+
+            try:
+                # A previous leader may have cached it since our miss
+                result = cache._peek(cache_key)
+                if result is None:
+                    result = func(query, *args, **kwargs)
+                    cache.set(query, result, ttl=ttl, tags=tags)
+                call.result = result
+                call.succeeded = True
+                return result
+            finally:
+                with in_flight_lock:
+                    del in_flight[cache_key]
+                call.done.set()
         return wrapper
     return decorator
@@ -11,6 +11,8 @@ Features:
 Helps achieve optimal cache utilization and query performance.
 """
 
+import hashlib
+import json
 import logging
 import re
 from dataclasses import dataclass, field
@@ -174,6 +176,12 @@ class QueryOptimizer:
         r'\blive\b',
     ]
 
+    # All volatile patterns as one alternation, so a query is scanned once
+    VOLATILE_PATTERN = re.compile(
+        "|".join(f"(?:{pattern})" for pattern in VOLATILE_PATTERNS),
+        re.IGNORECASE
+    )
+
     # Patterns for index suggestions
     WHERE_COLUMN_PATTERN = re.compile(
         r'\bWHERE\b.*?(\w+)\.(\w+)\s*=',
@@ -185,6 +193,11 @@ class QueryOptimizer:
         re.IGNORECASE | re.DOTALL
     )
 
+    # Splits SQL into quoted literals/identifiers (kept verbatim when building
+    # cache keys) and the text between them (whitespace and case normalized)
+    _SQL_QUOTED_PATTERN = re.compile(r"""('(?:[^']|'')*'|"(?:[^"]|"")*")""")
+    _WHITESPACE_PATTERN = re.compile(r'\s+')
+
     def __init__(self):
         """Initialize query optimizer."""
         logger.info("QueryOptimizer initialized")
@@ -256,10 +269,7 @@ class QueryOptimizer:
         normalized = query.upper()
 
         # Check for volatile patterns
-        is_volatile = any(
-            re.search(pattern, normalized, re.IGNORECASE)
-            for pattern in self.VOLATILE_PATTERNS
-        )
+        is_volatile = self.VOLATILE_PATTERN.search(normalized) is not None
 
         if is_volatile:
             return OptimizationSuggestion(
@@ -383,6 +393,55 @@ class QueryOptimizer:
 
         return suggestions
 
+    def generate_cache_key(self, query_info: Dict[str, Any]) -> str:
+        """Generate a fingerprint for a semantic query.
+
+        Only structure is normalized before hashing, never values: dimension
+        and measure lists are sorted, dict keys are ordered and list filters
+        are sorted by their JSON form. Generated SQL is only used when no
+        semantic fields are present; its keywords and spacing are normalized
+        outside quoted literals and identifiers.
+
+        Args:
+            query_info: Query description (model, dimensions, measures,
+                filters, limit, order_by, sql)
+
+        Returns:
+            Hex digest identifying the query
+        """
+        semantic_fields = ("model", "dimensions", "measures", "filters", "limit", "order_by")
+        if any(field_name in query_info for field_name in semantic_fields):
+            filters = query_info.get("filters") or {}
+            if not isinstance(filters, dict):
+                filters = sorted(filters, key=self._sort_key)
+
+            fingerprint = [
+                query_info.get("model"),
+                sorted(query_info.get("dimensions") or []),
+                sorted(query_info.get("measures") or []),
+                filters,
+                query_info.get("limit"),
+                query_info.get("order_by"),
+            ]
+        else:
+            fingerprint = [self._canonicalize_sql(query_info.get("sql", ""))]
+
+        payload = json.dumps(fingerprint, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _sort_key(value: Any) -> str:
+        """Order arbitrary filter entries (strings, dicts, ...) by their JSON form."""
+        return json.dumps(value, sort_keys=True, default=str)
+
+    def _canonicalize_sql(self, sql: str) -> str:
+        """Lower-case and collapse whitespace in SQL outside quoted text."""
+        parts = self._SQL_QUOTED_PATTERN.split(sql)
+        # split() with one group alternates unquoted text and quoted tokens
+        for i in range(0, len(parts), 2):
+            parts[i] = self._WHITESPACE_PATTERN.sub(" ", parts[i]).lower()
+        return "".join(parts).strip()
+
     def get_optimization_hints(self, query: str) -> Dict[str, Any]:
         """Get comprehensive optimization hints for query.
 
@@ -12,25 +12,113 @@ Features:
 - Cache integration hooks
 """
 
+import ast
 import logging
+import operator
 import os
 import re
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import ibis
+import numpy as np
+import pydantic
 import yaml
 
 from .exceptions import SemanticLayerError
 from .types import (
     AggregationType,
+    CanonicalDataset,
     DimensionType,
     MetricType,
 )
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - depends on PyYAML build
+    from yaml import SafeLoader as _YamlLoader
+
 logger = logging.getLogger(__name__)
 
+# Dimension values change far less often than metric results
+DIMENSION_VALUES_TTL_SECONDS = 24 * 3600
+
+# Query results are kept briefly so repeated refreshes skip the warehouse
+QUERY_RESULT_TTL_SECONDS = 300
+QUERY_RESULT_CACHE_SIZE = 256
+
+# Longer formulas are rejected before any component lookup or compilation
+MAX_FORMULA_LENGTH = 1000
+
+# Filter forms understood by _apply_filter, tried in order:
+# (pattern, comparison, value conversion)
+_FILTER_PATTERNS = (
+    (re.compile(r"(\w+)\s*=\s*['\"]([^'\"]+)['\"]"), operator.eq, str),
+    (re.compile(r"(\w+)\s*=\s*(\d+)"), operator.eq, int),
+    (re.compile(r"(\w+)\s*!=\s*['\"]([^'\"]+)['\"]"), operator.ne, str),
+    (re.compile(r"(\w+)\s*>=\s*(\d+\.?\d*)"), operator.ge, float),
+    (re.compile(r"(\w+)\s*<=\s*(\d+\.?\d*)"), operator.le, float),
+    (re.compile(r"(\w+)\s*>\s*(\d+\.?\d*)"), operator.gt, float),
+    (re.compile(r"(\w+)\s*<\s*(\d+\.?\d*)"), operator.lt, float),
+)
+
+
+# Column references inside a dimension's SQL expression: {{ Table }}.column
+_TABLE_COLUMN_PATTERN = re.compile(r"\{\{\s*Table\s*\}\}\.(\w+)")
+
+# Derived-metric formulas are plain arithmetic over metric names and numbers
+_FORMULA_BINARY_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div)
+_FORMULA_UNARY_OPERATORS = (ast.UAdd, ast.USub)
+
+
+@lru_cache(maxsize=256)
+def _parse_formula(formula: str) -> Tuple[Any, Tuple[str, ...]]:
+    """
+    Parse, validate and compile a derived-metric formula once.
+
+    Returns:
+        The compiled expression and the metric names it references
+
+    Raises:
+        SemanticLayerError: If the formula is not valid arithmetic
+    """
+    try:
+        expression = ast.parse(formula, mode="eval")
+    except SyntaxError as e:
+        raise SemanticLayerError(f"Invalid formula '{formula}': {e.msg}")
+
+    names = []
+    for node in ast.walk(expression.body):
+        if isinstance(node, ast.BinOp):
+            supported = isinstance(node.op, _FORMULA_BINARY_OPERATORS)
+        elif isinstance(node, ast.UnaryOp):
+            supported = isinstance(node.op, _FORMULA_UNARY_OPERATORS)
+        elif isinstance(node, ast.Name):
+            names.append(node.id)
+            supported = True
+        elif isinstance(node, ast.Constant):
+            supported = type(node.value) in (int, float)
+        else:
+            supported = isinstance(node, (ast.operator, ast.unaryop, ast.expr_context))
+        if not supported:
+            raise SemanticLayerError(
+                f"Unsupported element in formula '{formula}': {type(node).__name__}"
+            )
+
+    # Only whitelisted arithmetic is left, so the tree can run as bytecode
+    return compile(expression, "<formula>", "eval"), tuple(dict.fromkeys(names))
+
+
+def _evaluate_formula(code, namespace: Dict[str, Any]) -> Any:
+    """Evaluate a compiled formula, resolving names from ``namespace``."""
+    return eval(code, {"__builtins__": {}}, namespace)
+
 
 class SemanticLayerManager:
     """
@@ -56,13 +144,47 @@ class SemanticLayerManager:
             raise SemanticLayerError(f"Configuration file not found: {config_path}")
 
         self.config = self._load_config()
+
+        # Canonical datasets are static for the lifetime of the manager;
+        # they are validated before a connection is opened
+        self.canonical_datasets: Tuple[CanonicalDataset, ...] = tuple(
+            self._load_canonical_dataset(dataset)
+            for dataset in self.config["semantic_model"].get("canonical_datasets") or []
+        )
+        self._canonical_by_name: Dict[str, CanonicalDataset] = {
+            dataset.name: dataset for dataset in self.canonical_datasets
+        }
+
+        # One connection is shared by every query for the manager's lifetime
         self.connection = self._create_connection()
-        self._cache: Dict[str, Any] = {}
+        self._closed = False
+        # query key -> (result without timestamp, monotonic expiry time), LRU order
+        self._cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        # Guards every cache below: queries arrive from worker threads
+        # (asyncio.to_thread)
+        self._cache_lock = threading.Lock()
         self._models_list_cache: Optional[List[Dict[str, Any]]] = None
+        self._metrics_list_cache: Optional[List[Dict[str, Any]]] = None
+        self._dimensions_list_cache: Optional[List[Dict[str, Any]]] = None
+        # (dimension name, limit) -> (values, monotonic expiry time)
+        self._dimension_values_cache: Dict[tuple, tuple] = {}
+        # Table name -> Ibis table, so schemas are introspected once
+        self._tables: Dict[str, Any] = {}
+        self._table_columns: Dict[str, frozenset] = {}
 
         # Load temporal dimensions if available
         self._load_temporal_dimensions()
 
+        # Name index so hits and misses alike cost a single dict lookup;
+        # the first definition of a name wins, as with a linear scan
+        self._metrics_by_name: Dict[str, Dict] = {}
+        for metric in self.config["semantic_model"]["metrics"]:
+            self._metrics_by_name.setdefault(metric["name"], metric)
+        self._dimensions_by_name: Dict[str, Dict] = {}
+        for dim in self.config["semantic_model"].get("dimensions", []):
+            self._dimensions_by_name.setdefault(dim["name"], dim)
+        self._available_metrics_message: Optional[str] = None
+
         logger.info(f"Semantic layer initialized with {len(self.list_metrics())} metrics")
 
     def _load_config(self) -> Dict:
@@ -75,7 +197,7 @@ class SemanticLayerManager:
             expanded_content = self._expand_env_vars(raw_content)
 
             # Parse YAML
-            config = yaml.safe_load(expanded_content)
+            config = yaml.load(expanded_content, Loader=_YamlLoader)
 
             # Validate required sections
             if not config or "semantic_model" not in config:
@@ -97,6 +219,15 @@ class SemanticLayerManager:
         except yaml.YAMLError as e:
             raise SemanticLayerError(f"Error parsing YAML configuration: {e}")
 
+    @staticmethod
+    def _load_canonical_dataset(dataset: Any) -> CanonicalDataset:
+        """Validate one canonical_datasets entry from the configuration."""
+        try:
+            return CanonicalDataset(**dataset)
+        except (pydantic.ValidationError, TypeError) as e:
+            name = dataset.get("name", "<unnamed>") if isinstance(dataset, dict) else dataset
+            raise SemanticLayerError(f"Invalid canonical dataset '{name}': {e}")
+
     def _expand_env_vars(self, content: str) -> str:
         """Expand environment variables in configuration content."""
         def replace_var(match):
@@ -132,8 +263,9 @@ class SemanticLayerManager:
 
         if temporal_config_path.exists():
             try:
-                with open(temporal_config_path, "r") as f:
-                    temporal_config = yaml.safe_load(f)
+                # Bytes let libyaml detect and decode the encoding itself
+                with open(temporal_config_path, "rb") as f:
+                    temporal_config = yaml.load(f, Loader=_YamlLoader)
 
                 if temporal_config and "temporal_dimensions" in temporal_config:
                     if "dimensions" not in self.config["semantic_model"]:
@@ -197,11 +329,17 @@ class SemanticLayerManager:
         """
         List all available metrics.
 
+        The list is built once and reused until clear_cache() is called;
+        callers must not mutate it.
+
         Returns:
             List of metric definitions with metadata
         """
+        if self._metrics_list_cache is not None:
+            return self._metrics_list_cache
+
         metrics = self.config["semantic_model"].get("metrics", [])
-        return [
+        self._metrics_list_cache = [
             {
                 "name": m["name"],
                 "display_name": m.get("display_name", m["name"]),
@@ -210,6 +348,7 @@ class SemanticLayerManager:
             }
             for m in metrics
         ]
+        return self._metrics_list_cache
 
     def get_metric(self, metric_name: str) -> Dict:
         """
@@ -224,20 +363,27 @@ class SemanticLayerManager:
         Raises:
             SemanticLayerError: If metric not found
         """
-        metrics = self.config["semantic_model"]["metrics"]
-        for metric in metrics:
-            if metric["name"] == metric_name:
-                return metric
-
-        available = [m["name"] for m in metrics]
+        metric = self._metrics_by_name.get(metric_name)
+        if metric is not None:
+            return metric
+
+        # The list of names is joined once, on the first miss
+        if self._available_metrics_message is None:
+            self._available_metrics_message = ", ".join(
+                m["name"] for m in self.config["semantic_model"]["metrics"]
+            )
         raise SemanticLayerError(
-            f"Metric '{metric_name}' not found. Available metrics: {', '.join(available)}"
+            f"Metric '{metric_name}' not found. Available metrics: "
+            f"{self._available_metrics_message}"
         )
 
     def list_dimensions(self) -> List[Dict]:
-        """List all available dimensions."""
+        """List all available dimensions (cached like list_metrics)."""
+        if self._dimensions_list_cache is not None:
+            return self._dimensions_list_cache
+
         dimensions = self.config["semantic_model"].get("dimensions", [])
-        return [
+        self._dimensions_list_cache = [
             {
                 "name": d["name"],
                 "type": d.get("type", "categorical"),
@@ -248,14 +394,61 @@ class SemanticLayerManager:
             }
             for d in dimensions
         ]
+        return self._dimensions_list_cache
 
     def get_dimension(self, dimension_name: str) -> Optional[Dict]:
         """Get dimension definition by name."""
-        dimensions = self.config["semantic_model"].get("dimensions", [])
-        for dim in dimensions:
-            if dim["name"] == dimension_name:
-                return dim
-        return None
+        return self._dimensions_by_name.get(dimension_name)
+
+    def get_canonical_dataset(self, dataset_name: str) -> Optional[CanonicalDataset]:
+        """Get canonical dataset definition by name."""
+        return self._canonical_by_name.get(dataset_name)
+
+    def get_dimension_values(
+        self,
+        dimension_name: str,
+        limit: int = 100,
+        ttl: int = DIMENSION_VALUES_TTL_SECONDS,
+    ) -> List[Any]:
+        """
+        Get distinct values of a dimension.
+
+        Values are cached per (dimension, limit) for ``ttl`` seconds, which
+        defaults to a day since dimension cardinality changes slowly.
+
+        Args:
+            dimension_name: Name of the dimension
+            limit: Maximum number of distinct values to return
+            ttl: Seconds to keep the values cached
+
+        Returns:
+            List of distinct dimension values
+
+        Raises:
+            SemanticLayerError: If the dimension is not found or the query fails
+        """
+        cache_key = (dimension_name, limit)
+        with self._cache_lock:
+            cached = self._dimension_values_cache.get(cache_key)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+
+        dim = self.get_dimension(dimension_name)
+        if dim is None:
+            raise SemanticLayerError(f"Dimension '{dimension_name}' not found")
+
+        try:
+            table_name = dim["table"]
+            table = self._get_table(table_name)
+            expr = self._resolve_dimension_expression(dim, table, table_name, dimension_name)
+            result_df = table.select(expr).distinct().limit(limit).execute()
+            values = result_df[dimension_name].tolist()
+        except Exception as e:
+            raise SemanticLayerError(f"Failed to get values for '{dimension_name}': {e}")
+
+        with self._cache_lock:
+            self._dimension_values_cache[cache_key] = (values, time.monotonic() + ttl)
+        return values
 
     def query_metric(
         self,
@@ -264,16 +457,24 @@ class SemanticLayerManager:
         filters: Optional[List[str]] = None,
         limit: Optional[int] = None,
         order_by: Optional[str] = None,
+        preview_rows: Optional[int] = None,
+        use_cache: bool = True,
     ) -> Dict:
         """
         Query a metric with optional dimensions and filters.
 
+        Results are cached for ``QUERY_RESULT_TTL_SECONDS`` per distinct
+        combination of arguments; a hit skips query compilation and execution.
+
         Args:
             metric_name: Name of metric to query
             dimensions: List of dimension names to group by
             filters: List of SQL WHERE conditions
             limit: Maximum rows to return
             order_by: Column to sort by (prefix with - for descending)
+            preview_rows: Only fetch this many rows; for simple metrics the
+                untruncated row count is reported as ``total_row_count``
+            use_cache: Set to False to bypass the result cache
 
         Returns:
             Dictionary containing query results and metadata
@@ -281,87 +482,254 @@ class SemanticLayerManager:
         Raises:
             SemanticLayerError: If query fails
         """
+        # Filters are ANDed together, so their order does not matter
+        cache_key = (
+            metric_name,
+            tuple(dimensions or ()),
+            tuple(sorted(filters or ())),
+            limit,
+            order_by,
+            preview_rows,
+        )
+        if use_cache:
+            with self._cache_lock:
+                cached = self._cache.get(cache_key)
+                if cached is not None:
+                    if cached[1] > time.monotonic():
+                        self._cache.move_to_end(cache_key)
+                    else:
+                        del self._cache[cache_key]
+                        cached = None
+            if cached is not None:
+                return self._copy_result(cached[0], timestamp=datetime.now().isoformat())
+
         try:
             metric = self.get_metric(metric_name)
             metric_type = metric.get("type", "simple")
 
             logger.info(f"Querying metric: {metric_name} (type: {metric_type})")
 
+            query_limit = self._preview_limit(limit, preview_rows)
+
             if metric_type == "simple":
                 result_df, sql = self._query_simple_metric(
-                    metric, dimensions, filters, limit, order_by
+                    metric, dimensions, filters, query_limit, order_by
                 )
             elif metric_type == "derived":
                 result_df, sql = self._query_derived_metric(
-                    metric, dimensions, filters, limit, order_by
+                    metric, dimensions, filters, query_limit, order_by
                 )
             else:
                 raise SemanticLayerError(f"Unknown metric type: {metric_type}")
 
-            # Handle NaN results
-            data = result_df.to_dict("records")
-            row_count = len(result_df)
+            result = self._build_metric_result(metric, dimensions, result_df, sql)
 
-            if row_count == 1 and len(data) == 1:
-                import math
-                metric_value = data[0].get(metric_name)
-                if metric_value is not None and isinstance(metric_value, (int, float)):
-                    if math.isnan(metric_value):
-                        data = []
-                        row_count = 0
+            if query_limit != limit and metric_type == "simple":
+                result["total_row_count"] = self._preview_total_rows(
+                    [metric], dimensions, filters, len(result_df), query_limit, limit
+                )
+
+            # The cache keeps its own copy so callers can't change cached rows
+            entry = (self._copy_result(result), time.monotonic() + QUERY_RESULT_TTL_SECONDS)
+            with self._cache_lock:
+                self._cache[cache_key] = entry
+                self._cache.move_to_end(cache_key)
+                if len(self._cache) > QUERY_RESULT_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+
+            return result
+
+        except Exception as e:
+            logger.error(f"Error querying metric {metric_name}: {e}")
+            raise SemanticLayerError(f"Query failed: {e}")
+
+    def query_metrics(
+        self,
+        metric_names: List[str],
+        dimensions: Optional[List[str]] = None,
+        filters: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        order_by: Optional[str] = None,
+        preview_rows: Optional[int] = None,
+    ) -> Dict:
+        """
+        Query several metrics over the same dimensions and filters.
+
+        Simple metrics that read the same table with the same metric-level
+        filters are aggregated together in a single GROUP BY query. Derived
+        metrics and metrics on other tables fall back to one query each.
+
+        Args:
+            metric_names: Names of metrics to query
+            dimensions: List of dimension names to group by
+            filters: List of SQL WHERE conditions
+            limit: Maximum rows to return per query
+            order_by: Column to sort by (prefix with - for descending)
+            preview_rows: Only fetch this many rows per metric (see query_metric)
+
+        Returns:
+            Dictionary with per-metric results keyed by metric name, each in
+            the same shape as query_metric()
+
+        Raises:
+            SemanticLayerError: If any query fails
+        """
+        try:
+            metrics = [self.get_metric(name) for name in metric_names]
+
+            # Group simple metrics that can share one aggregation query
+            batches: Dict[tuple, List[Dict]] = {}
+            for metric in metrics:
+                if metric.get("type", "simple") != "simple":
+                    continue
+                calc = metric["calculation"]
+                batch_key = (calc["table"], tuple(calc.get("filters", [])))
+                batches.setdefault(batch_key, []).append(metric)
+
+            query_limit = self._preview_limit(limit, preview_rows)
+
+            results: Dict[str, Dict] = {}
+            for batch in batches.values():
+                if len(batch) < 2:
+                    continue
+                logger.info(
+                    f"Querying {len(batch)} metrics in one pass on {batch[0]['calculation']['table']}"
+                )
+                result_df, sql = self._query_simple_metrics(
+                    batch, dimensions, filters, query_limit, order_by
+                )
+                total = None
+                if query_limit != limit:
+                    total = self._preview_total_rows(
+                        batch, dimensions, filters, len(result_df), query_limit, limit
+                    )
+                for metric in batch:
+                    columns = list(dimensions or []) + [metric["name"]]
+                    results[metric["name"]] = self._build_metric_result(
+                        metric, dimensions, result_df[columns], sql
+                    )
+                    if total is not None:
+                        results[metric["name"]]["total_row_count"] = total
+
+            for metric in metrics:
+                if metric["name"] not in results:
+                    results[metric["name"]] = self.query_metric(
+                        metric["name"], dimensions, filters, limit, order_by, preview_rows
+                    )
 
             return {
-                "metric": metric_name,
-                "display_name": metric.get("display_name", metric_name),
-                "description": metric.get("description", ""),
+                "metrics": list(metric_names),
                 "dimensions": dimensions or [],
-                "data": data,
-                "row_count": row_count,
-                "sql": sql,
+                "results": {name: results[name] for name in metric_names},
                 "timestamp": datetime.now().isoformat(),
             }
 
         except Exception as e:
-            logger.error(f"Error querying metric {metric_name}: {e}")
+            logger.error(f"Error querying metrics {metric_names}: {e}")
             raise SemanticLayerError(f"Query failed: {e}")
 
+    def query_canonical_dataset(
+        self,
+        dataset_name: str,
+        filters: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        preview_rows: Optional[int] = None,
+    ) -> Dict:
+        """
+        Query all metrics of a canonical dataset over its dimensions.
+
+        Args:
+            dataset_name: Name of the canonical dataset
+            filters: List of SQL WHERE conditions
+            limit: Maximum rows to return per query
+            preview_rows: Only fetch this many rows per metric (see query_metric)
+
+        Returns:
+            Dictionary with dataset metadata and per-metric results
+
+        Raises:
+            SemanticLayerError: If the dataset is not found or a query fails
+        """
+        dataset = self._canonical_by_name.get(dataset_name)
+        if dataset is None:
+            available = list(self._canonical_by_name)
+            raise SemanticLayerError(
+                f"Canonical dataset '{dataset_name}' not found. "
+                f"Available datasets: {', '.join(available)}"
+            )
+
+        batch = self.query_metrics(
+            dataset.metrics, dataset.dimensions, filters, limit, preview_rows=preview_rows
+        )
+
+        return {
+            "dataset": dataset.name,
+            "display_name": dataset.display_name or dataset.name,
+            "description": dataset.description or "",
+            "dimensions": dataset.dimensions,
+            "results": batch["results"],
+            "timestamp": batch["timestamp"],
+        }
+
+    @staticmethod
+    def _copy_result(result: Dict, **overrides: Any) -> Dict:
+        """Copy a query_metric() result down to its rows, applying overrides."""
+        return {**result, "data": [dict(row) for row in result["data"]], **overrides}
+
+    @staticmethod
+    def _preview_limit(limit: Optional[int], preview_rows: Optional[int]) -> Optional[int]:
+        """Return the row limit to query with when only a preview is needed."""
+        if preview_rows is not None and preview_rows > 0 and (not limit or preview_rows < limit):
+            return preview_rows
+        return limit
+
+    def _build_metric_result(
+        self,
+        metric: Dict,
+        dimensions: Optional[List[str]],
+        result_df,
+        sql: str,
+    ) -> Dict:
+        """Assemble the query_metric() response from a result DataFrame."""
+        metric_name = metric["name"]
+        row_count = len(result_df)
+
+        # A single missing aggregate (e.g. SUM over no rows) means no data;
+        # checking the column first avoids converting a row we'd discard
+        if (
+            row_count == 1
+            and metric_name in result_df.columns
+            and result_df[metric_name].isna().iat[0]
+        ):
+            row_count = 0
+
+        # Empty results skip record conversion entirely
+        if row_count == 0:
+            data = []
+        else:
+            data = result_df.to_dict("records")
+
+        return {
+            "metric": metric_name,
+            "display_name": metric.get("display_name", metric_name),
+            "description": metric.get("description", ""),
+            "dimensions": dimensions or [],
+            "data": data,
+            "row_count": row_count,
+            "sql": sql,
+            "timestamp": datetime.now().isoformat(),
+        }
+
     def _apply_filter(self, table, filter_expr: str):
         """Apply a filter expression to a table."""
         filter_expr = filter_expr.strip()
 
-        # Handle equality: column = 'value'
-        match = re.match(r"(\w+)\s*=\s*['\"]([^'\"]+)['\"]", filter_expr)
-        if match:
-            column, value = match.groups()
-            if column in table.columns:
-                return table.filter(table[column] == value)
-
-        # Handle equality with numbers: column = 123
-        match = re.match(r"(\w+)\s*=\s*(\d+)", filter_expr)
-        if match:
-            column, value = match.groups()
-            if column in table.columns:
-                return table.filter(table[column] == int(value))
-
-        # Handle inequality: column != 'value'
-        match = re.match(r"(\w+)\s*!=\s*['\"]([^'\"]+)['\"]", filter_expr)
-        if match:
-            column, value = match.groups()
-            if column in table.columns:
-                return table.filter(table[column] != value)
-
-        # Handle comparisons
-        for op, op_func in [
-            (r">=", lambda t, c, v: t.filter(t[c] >= float(v))),
-            (r"<=", lambda t, c, v: t.filter(t[c] <= float(v))),
-            (r">", lambda t, c, v: t.filter(t[c] > float(v))),
-            (r"<", lambda t, c, v: t.filter(t[c] < float(v))),
-        ]:
-            match = re.match(rf"(\w+)\s*{op}\s*(\d+\.?\d*)", filter_expr)
+        for pattern, compare, convert in _FILTER_PATTERNS:
+            match = pattern.match(filter_expr)
             if match:
                 column, value = match.groups()
                 if column in table.columns:
-                    return op_func(table, column, value)
+                    return table.filter(compare(table[column], convert(value)))
 
         logger.warning(f"Could not parse filter expression: {filter_expr}")
         return table
@@ -374,8 +742,7 @@ class SemanticLayerManager:
 
         if "sql" in dim and dim["sql"]:
             sql_expr = dim["sql"]
-            table_ref_pattern = r'\{\{\s*Table\s*\}\}\.(\w+)'
-            col_matches = re.findall(table_ref_pattern, sql_expr)
+            col_matches = _TABLE_COLUMN_PATTERN.findall(sql_expr)
 
             if not col_matches:
                 raise SemanticLayerError(
@@ -434,9 +801,88 @@ class SemanticLayerManager:
         order_by: Optional[str],
     ) -> tuple:
         """Execute query for simple (aggregated) metric."""
-        calc = metric["calculation"]
+        return self._query_simple_metrics([metric], dimensions, filters, limit, order_by)
+
+    def _query_simple_metrics(
+        self,
+        metrics: List[Dict],
+        dimensions: Optional[List[str]],
+        filters: Optional[List[str]],
+        limit: Optional[int],
+        order_by: Optional[str],
+    ) -> tuple:
+        """
+        Execute one aggregation query for simple metrics sharing a source table.
+
+        All metrics must read the same table with the same metric-level filters;
+        each aggregate is returned as a column named after its metric.
+        """
+        result = self._build_simple_metrics_expr(metrics, dimensions, filters)
+
+        # Apply ordering
+        if order_by:
+            if order_by.startswith("-"):
+                result = result.order_by(ibis.desc(order_by[1:]))
+            else:
+                result = result.order_by(order_by)
+
+        # Apply limit
+        if limit:
+            result = result.limit(limit)
+
+        sql = ibis.to_sql(result)
+        result_df = result.execute()
+
+        return result_df, sql
+
+    def _get_table(self, table_name: str):
+        """Return the Ibis table for a name, looking its schema up only once."""
+        with self._cache_lock:
+            table = self._tables.get(table_name)
+            if table is None:
+                table = self._tables[table_name] = self.connection.table(table_name)
+                self._table_columns[table_name] = frozenset(table.columns)
+            return table
+
+    def _count_simple_metric_rows(
+        self,
+        metrics: List[Dict],
+        dimensions: Optional[List[str]],
+        filters: Optional[List[str]],
+    ) -> int:
+        """Count the rows an unlimited simple-metric query would return."""
+        return int(self._build_simple_metrics_expr(metrics, dimensions, filters).count().execute())
+
+    def _preview_total_rows(
+        self,
+        metrics: List[Dict],
+        dimensions: Optional[List[str]],
+        filters: Optional[List[str]],
+        fetched_rows: int,
+        query_limit: int,
+        limit: Optional[int],
+    ) -> int:
+        """
+        Return the row count a previewed query would have had without the preview.
+
+        A preview that came back short of its limit already holds every row,
+        so the separate COUNT query is only issued when the preview is full.
+        """
+        if fetched_rows < query_limit:
+            return fetched_rows
+        total = self._count_simple_metric_rows(metrics, dimensions, filters)
+        return min(total, limit) if limit else total
+
+    def _build_simple_metrics_expr(
+        self,
+        metrics: List[Dict],
+        dimensions: Optional[List[str]],
+        filters: Optional[List[str]],
+    ):
+        """Build the unordered, unlimited aggregation expression for simple metrics."""
+        calc = metrics[0]["calculation"]
         table_name = calc["table"]
-        table = self.connection.table(table_name)
+        table = self._get_table(table_name)
 
         # Apply metric-defined filters
         for filter_expr in calc.get("filters", []):
@@ -447,73 +893,103 @@ class SemanticLayerManager:
             for filter_expr in filters:
                 table = self._apply_filter(table, filter_expr)
 
-        # Build aggregation
-        agg_type = calc["aggregation"]
-        column_name = calc["column"]
-        agg_column = table[column_name]
-
-        agg_map = {
-            "sum": agg_column.sum,
-            "count": agg_column.count,
-            "count_distinct": agg_column.nunique,
-            "avg": agg_column.mean,
-            "average": agg_column.mean,
-            "mean": agg_column.mean,
-            "min": agg_column.min,
-            "max": agg_column.max,
-        }
-
-        if agg_type not in agg_map:
-            raise SemanticLayerError(f"Unknown aggregation type: {agg_type}")
-
-        agg_expr = agg_map[agg_type]().name(metric["name"])
+        # Build aggregations
+        agg_exprs = [self._build_aggregation(metric, table) for metric in metrics]
 
         # Handle dimensions
         if dimensions:
+            # Each dimension table is joined once, carrying only the columns
+            # its dimensions read, however many of them are requested
+            foreign_dims: Dict[str, List[Dict]] = {}
+            for dim_name in dimensions:
+                dim = self.get_dimension(dim_name)
+                if dim and dim.get("table") and dim["table"] != table_name:
+                    foreign_dims.setdefault(dim["table"], []).append(dim)
+            for dim_table, dims in foreign_dims.items():
+                table = self._join_dimension_table(table, table_name, dim_table, dims)
+
             group_by_columns = []
             for dim_name in dimensions:
                 dim = self.get_dimension(dim_name)
                 if dim:
-                    dim_table = dim.get("table")
-                    if dim_table and dim_table != table_name:
-                        dim_table_obj = self.connection.table(dim_table)
-                        common_cols = set(table.columns) & set(dim_table_obj.columns)
-                        if common_cols:
-                            join_key = list(common_cols)[0]
-                            table = table.join(dim_table_obj, join_key, how="left")
-                            dim_expr = self._resolve_dimension_expression(dim, table, dim_table, dim_name)
-                            group_by_columns.append(dim_expr)
-                        else:
-                            raise SemanticLayerError(
-                                f"Cannot join {table_name} with {dim_table} - no common columns"
-                            )
-                    else:
-                        dim_expr = self._resolve_dimension_expression(dim, table, table_name, dim_name)
-                        group_by_columns.append(dim_expr)
+                    source_table = dim.get("table") or table_name
+                    dim_expr = self._resolve_dimension_expression(dim, table, source_table, dim_name)
+                    group_by_columns.append(dim_expr)
                 elif dim_name in table.columns:
                     group_by_columns.append(table[dim_name])
                 else:
                     raise SemanticLayerError(f"Dimension '{dim_name}' not found")
 
-            result = table.group_by(group_by_columns).aggregate(agg_expr)
+            return table.group_by(group_by_columns).aggregate(agg_exprs)
+
+        # Without dimensions, no matching rows still aggregate to one all-NULL
+        # row; filter it out in the warehouse so nothing is sent back instead.
+        # view() makes the filter read the aggregate's output columns rather
+        # than re-aggregating in a scalar subquery
+        result = table.aggregate(agg_exprs).view()
+        return result.filter(ibis.or_(*(result[metric["name"]].notnull() for metric in metrics)))
+
+    def _join_dimension_table(self, table, table_name: str, dim_table: str, dims: List[Dict]):
+        """
+        Left-join a dimension table onto ``table`` for the given dimensions.
+
+        The join key comes from a ``join_key`` declared on any of the
+        dimensions. Otherwise the shared columns are ranked ``*_id`` first,
+        then by name, so the same query always joins the same way. Only the
+        key and the columns the dimensions read are projected into the join.
+
+        Raises:
+            SemanticLayerError: If the tables share no usable column
+        """
+        dim_table_obj = self._get_table(dim_table)
+        dim_columns = self._table_columns[dim_table]
+        common_cols = dim_columns.intersection(table.columns)
+
+        join_key = next((dim["join_key"] for dim in dims if dim.get("join_key")), None)
+        if join_key:
+            if join_key not in common_cols:
+                raise SemanticLayerError(
+                    f"Join key '{join_key}' is not in both {table_name} and {dim_table}"
+                )
+        elif common_cols:
+            join_key = min(common_cols, key=lambda col: (not col.endswith("_id"), col))
+            logger.debug(f"Joining {table_name} with {dim_table} on {join_key}")
         else:
-            result = table.aggregate(agg_expr)
+            raise SemanticLayerError(
+                f"Cannot join {table_name} with {dim_table} - no common columns"
+            )
 
-        # Apply ordering
-        if order_by:
-            if order_by.startswith("-"):
-                result = result.order_by(ibis.desc(order_by[1:]))
+        projection = dict.fromkeys([join_key])
+        for dim in dims:
+            if dim.get("sql"):
+                source_columns = _TABLE_COLUMN_PATTERN.findall(dim["sql"])
             else:
-                result = result.order_by(order_by)
+                source_columns = [dim.get("column", dim["name"])]
+            projection.update(dict.fromkeys(col for col in source_columns if col in dim_columns))
 
-        # Apply limit
-        if limit:
-            result = result.limit(limit)
+        return table.join(dim_table_obj.select(*projection), join_key, how="left")
 
-        sql = ibis.to_sql(result)
-        result_df = result.execute()
+    def _build_aggregation(self, metric: Dict, table):
+        """Build the named aggregate expression for a simple metric."""
+        calc = metric["calculation"]
+        agg_type = calc["aggregation"]
+        agg_column = table[calc["column"]]
 
-        return result_df, sql
+        agg_map = {
+            "sum": agg_column.sum,
+            "count": agg_column.count,
+            "count_distinct": agg_column.nunique,
+            "avg": agg_column.mean,
+            "average": agg_column.mean,
+            "mean": agg_column.mean,
+            "min": agg_column.min,
+            "max": agg_column.max,
+        }
+
+        if agg_type not in agg_map:
+            raise SemanticLayerError(f"Unknown aggregation type: {agg_type}")
+
+        return agg_map[agg_type]().name(metric["name"])
 
     def _query_derived_metric(
         self,
@@ -524,34 +1000,51 @@ class SemanticLayerManager:
         order_by: Optional[str],
     ) -> tuple:
         """Execute query for derived metric (calculated from other metrics)."""
-        import pandas as pd
-
         calc = metric["calculation"]
         formula = calc.get("formula")
 
         if not formula:
             raise SemanticLayerError(f"Derived metric '{metric['name']}' missing formula")
 
-        # Extract component metrics
-        component_metric_names = re.findall(r"\b([a-z_]+)\b", formula)
-        component_metric_names = [
-            m for m in set(component_metric_names)
-            if not m.replace("_", "").isdigit()
-        ]
+        if len(formula) > MAX_FORMULA_LENGTH:
+            raise SemanticLayerError(
+                f"Derived metric '{metric['name']}' formula exceeds "
+                f"{MAX_FORMULA_LENGTH} characters"
+            )
+
+        # Invalid formulas fail here, before any component is queried
+        code, formula_names = _parse_formula(formula)
+
+        # Component metrics, in the order the formula names them
+        component_metric_names = list(formula_names)
 
         logger.info(f"Derived metric '{metric['name']}' uses components: {component_metric_names}")
 
-        # Query component metrics
-        component_data = {}
+        # Group components that can share one aggregation query, as query_metrics does
+        batches: Dict[tuple, List[Dict]] = {}
         for comp_name in component_metric_names:
             try:
                 comp_metric = self.get_metric(comp_name)
-                comp_result, _ = self._query_simple_metric(
-                    comp_metric, dimensions, filters, limit, order_by
-                )
-                component_data[comp_name] = comp_result
+                comp_calc = comp_metric["calculation"]
+                batch_key = (comp_calc["table"], tuple(comp_calc.get("filters", [])))
             except Exception as e:
                 logger.warning(f"Could not query component metric '{comp_name}': {e}")
+                continue
+            batches.setdefault(batch_key, []).append(comp_metric)
+
+        # Query component metrics, one round trip per batch
+        component_data = {}
+        for batch in batches.values():
+            try:
+                comp_result, _ = self._query_simple_metrics(
+                    batch, dimensions, filters, limit, order_by
+                )
+                component_data[batch[0]["name"]] = comp_result
+            except Exception as e:
+                for comp_metric in batch:
+                    logger.warning(
+                        f"Could not query component metric '{comp_metric['name']}': {e}"
+                    )
 
         if not component_data:
             raise SemanticLayerError(
@@ -564,21 +1057,50 @@ class SemanticLayerManager:
             if dimensions:
                 result_df = result_df.merge(comp_df, on=dimensions, how="outer")
             else:
+                if len(comp_df) == 0:
+                    # A component with no matching rows leaves nothing to combine
+                    result_df = result_df.iloc[0:0]
                 for col in comp_df.columns:
                     if col not in result_df.columns:
-                        result_df[col] = comp_df[col].iloc[0] if len(comp_df) > 0 else 0
+                        result_df[col] = comp_df[col].iloc[0] if len(comp_df) > 0 else None
 
-        # Evaluate formula
-        namespace = {col: result_df[col] for col in result_df.columns}
+        columns = list(result_df.columns)
 
         try:
-            if len(result_df) > 0:
-                results = []
-                for _, row in result_df.iterrows():
-                    row_namespace = {col: row[col] for col in namespace.keys()}
-                    result = eval(formula, {"__builtins__": {}}, row_namespace)
-                    results.append(result)
-                result_df[metric["name"]] = results
+            if len(result_df) == 1:
+                # A single row (e.g. no dimensions) needs no arrays at all.
+                # Its NumPy scalars keep numeric semantics, so x / 0 on float
+                # or integer columns gives inf rather than raising
+                row = {
+                    name: result_df[name].to_numpy()[0]
+                    for name in formula_names
+                    if name in result_df.columns
+                }
+                result_df[metric["name"]] = [_evaluate_formula(code, row)]
+            elif len(result_df) > 0:
+                try:
+                    arrays = {
+                        name: result_df[name].to_numpy()
+                        for name in formula_names
+                        if name in result_df.columns
+                    }
+                    # DuckDB returns Decimal objects for some aggregates; keep
+                    # mixed operands as Python objects so Decimal / int works
+                    if any(arr.dtype == object for arr in arrays.values()):
+                        arrays = {name: arr.astype(object) for name, arr in arrays.items()}
+                    # Evaluate once over whole columns; numpy errors are raised
+                    # so division by zero is not silently turned into inf
+                    with np.errstate(divide="raise", invalid="raise"):
+                        values = _evaluate_formula(code, arrays)
+                    values = np.broadcast_to(values, (len(result_df),)).copy()
+                except Exception:
+                    # Fall back to row-by-row evaluation over plain tuples,
+                    # which raises the precise per-row error if there is one
+                    values = [
+                        _evaluate_formula(code, dict(zip(columns, row)))
+                        for row in result_df.itertuples(index=False, name=None)
+                    ]
+                result_df[metric["name"]] = values
             else:
                 result_df[metric["name"]] = None
         except Exception as e:
@@ -591,39 +1113,88 @@ class SemanticLayerManager:
         """Get a human-readable explanation of how a metric is calculated."""
         metric = self.get_metric(metric_name)
 
-        explanation = f"**{metric.get('display_name', metric_name)}**\n\n"
-        explanation += f"{metric.get('description', 'No description provided')}\n\n"
-
         metric_type = metric.get("type", "simple")
-        explanation += f"**Type:** {metric_type}\n\n"
+        parts = [
+            f"**{metric.get('display_name', metric_name)}**\n\n",
+            f"{metric.get('description', 'No description provided')}\n\n",
+            f"**Type:** {metric_type}\n\n",
+        ]
 
         if metric_type == "simple":
             calc = metric["calculation"]
-            explanation += f"**Calculation:**\n"
-            explanation += f"  - Aggregation: {calc['aggregation']}\n"
-            explanation += f"  - Column: {calc['column']}\n"
-            explanation += f"  - Table: {calc['table']}\n"
+            parts.append("**Calculation:**\n")
+            parts.append(f"  - Aggregation: {calc['aggregation']}\n")
+            parts.append(f"  - Column: {calc['column']}\n")
+            parts.append(f"  - Table: {calc['table']}\n")
 
             filters = calc.get("filters", [])
             if filters:
-                explanation += f"\n**Filters:**\n"
-                for f in filters:
-                    explanation += f"  - {f}\n"
+                parts.append("\n**Filters:**\n")
+                parts.extend(f"  - {f}\n" for f in filters)
 
         elif metric_type == "derived":
             calc = metric["calculation"]
-            explanation += f"**Formula:** {calc.get('formula', 'Not specified')}\n"
+            parts.append(f"**Formula:** {calc.get('formula', 'Not specified')}\n")
+
+        return "".join(parts)
+
+    def warm_up(
+        self, query_metrics: bool = True, deadline: Optional[float] = None
+    ) -> Dict[str, bool]:
+        """
+        Prime the connection and query compilation paths before real traffic.
+
+        Runs a trivial ``SELECT 1`` and, optionally, a one-row query per metric
+        so the first user-facing request doesn't pay connection setup, schema
+        reflection and expression compilation costs.
 
-        return explanation
+        Args:
+            query_metrics: Whether to run a one-row query for every metric
+            deadline: Optional ``time.monotonic()`` value; metrics not yet
+                queried when it passes are skipped
+
+        Returns:
+            Dictionary mapping metric name to whether its warm-up query succeeded
+        """
+        self.connection.sql("SELECT 1").execute()
+
+        warmed: Dict[str, bool] = {}
+        if not query_metrics:
+            return warmed
+
+        for metric in self.config["semantic_model"].get("metrics", []):
+            if deadline is not None and time.monotonic() >= deadline:
+                logger.warning("Warm-up deadline reached, skipping remaining metrics")
+                break
+            metric_name = metric["name"]
+            try:
+                self.query_metric(metric_name, limit=1)
+                warmed[metric_name] = True
+            except SemanticLayerError as e:
+                logger.warning(f"Warm-up query failed for metric {metric_name}: {e}")
+                warmed[metric_name] = False
+
+        logger.info(f"Warmed up {sum(warmed.values())}/{len(warmed)} metrics")
+        return warmed
 
     def clear_cache(self):
         """Clear the query result cache."""
-        self._cache = {}
-        self._models_list_cache = None
+        with self._cache_lock:
+            self._cache.clear()
+            self._models_list_cache = None
+            self._metrics_list_cache = None
+            self._dimensions_list_cache = None
+            self._dimension_values_cache = {}
+            self._tables = {}
+            self._table_columns = {}
         logger.info("Cache cleared")
 
     def close(self):
-        """Close database connection."""
+        """Close database connection. Safe to call more than once."""
+        if self._closed:
+            return
+        self._closed = True
+
         if hasattr(self.connection, "close"):
             self.connection.close()
             logger.info("Database connection closed")
@@ -250,6 +250,13 @@ class TestModelDiscovery:
         assert "Customer-level" in model.description
         assert len(model.columns) > 0
 
+    def test_iter_models_yields_lazily(self, bridge: DbtSemanticBridge):
+        """Test that iter_models streams the same models discover_models returns."""
+        iterator = bridge.iter_models()
+
+        assert not isinstance(iterator, list)
+        assert [m.name for m in iterator] == [m.name for m in bridge.discover_models()]
+
     def test_discover_models_filters_by_directory(self, bridge: DbtSemanticBridge):
         """Test filtering models by directory (marts only)."""
         models = bridge.discover_models(model_path="marts")
@@ -578,6 +585,23 @@ class TestFullSync:
         for metric in parsed["metrics"]:
             assert metric["type"] in ["simple", "derived"]
 
+    def test_sync_extracts_each_model_once(self, bridge: DbtSemanticBridge, monkeypatch):
+        """Test that sync counts from the same extraction it writes out."""
+        calls = []
+        original = bridge.extract_metrics
+
+        def counting_extract(model):
+            calls.append(model.name)
+            return original(model)
+
+        monkeypatch.setattr(bridge, "extract_metrics", counting_extract)
+        result = bridge.sync()
+
+        assert len(calls) == result.models_processed
+        parsed = yaml.safe_load(bridge.output_path.read_text())
+        assert result.metrics_generated == len(parsed["metrics"])
+        assert result.dimensions_generated == len(parsed["dimensions"])
+
     def test_sync_idempotent(self, bridge: DbtSemanticBridge):
         """Test that multiple syncs produce same result."""
         result1 = bridge.sync()
@@ -681,6 +705,21 @@ class TestSqlParsing:
         assert "segment" in group_by_cols
         assert "total" not in group_by_cols
 
+    def test_extract_select_columns_keeps_nested_commas(self, bridge: DbtSemanticBridge):
+        """Test that commas inside function calls do not split SELECT items."""
+        sql = """
+        SELECT
+            region,
+            COALESCE(SUM(amount), 0) as total,
+            ROUND(AVG(price), 2) as avg_price,
+            status
+        FROM orders
+        """
+
+        columns = bridge._extract_select_columns(sql)
+
+        assert columns == ["region", "total", "avg_price", "status"]
+
 
 # =============================================================================
 # Test: Edge Cases
@@ -430,6 +430,41 @@ class TestStatisticalTesterValidation:
         validation = await tester.validate_result(result, dimensions=["group"])
 
         assert "data_quality" in validation
+        assert validation["data_quality"] == {
+            "value": {"missing_count": 20, "missing_percent": 33.3}
+        }
+        assert any("high missing data: value" in w.lower() for w in validation["warnings"])
+
+    @pytest.mark.asyncio
+    async def test_validation_and_comparison_use_given_frame(self, tester):
+        """A caller-built DataFrame should be used instead of converting the rows."""
+        result = {
+            "data": [{"group": g, "value": i} for g in ("A", "B") for i in range(40)],
+            "metadata": {}
+        }
+        frame = pd.DataFrame(result["data"])
+
+        with patch("knowdb.intelligence.statistical.pd.DataFrame") as mock_frame:
+            validation = await tester.validate_result(result, ["group"], frame=frame)
+            test_result = await tester.auto_test_comparison(
+                result, ["group"], ["value"], frame=frame
+            )
+            mock_frame.assert_not_called()
+
+        assert validation["sample_sizes"]["total"] == 80
+        assert test_result is not None
+        assert frame.equals(pd.DataFrame(result["data"]))
+
+    @pytest.mark.asyncio
+    async def test_no_frame_kept_between_calls(self, tester):
+        """Rows changed in place should be seen by the next call."""
+        result = {"data": [{"group": "A", "value": 1.0}], "metadata": {}}
+        await tester.validate_result(result, dimensions=[])
+
+        result["data"][0]["value"] = None
+        validation = await tester.validate_result(result, dimensions=[])
+
+        assert validation["data_quality"]["value"]["missing_count"] == 1
 
 
 class TestStatisticalTesterTwoGroupTests:
@@ -530,6 +565,38 @@ class TestStatisticalTesterTwoGroupTests:
         assert "group_stds" in test_result
         assert len(test_result["group_means"]) == 2
 
+    @pytest.mark.asyncio
+    async def test_interleaved_groups_keep_first_seen_order(self, tester):
+        """Should partition interleaved rows by group in first-seen order."""
+        rows = []
+        for i in range(20):
+            rows.append({"group": "B", "metric": 10.0 + i})
+            rows.append({"group": "A", "metric": 20.0 + i})
+        rows.append({"group": "C", "metric": 1.0})  # Too small to test
+
+        test_result = await tester.auto_test_comparison(
+            {"data": rows, "metadata": {}}, dimensions=["group"], measures=["metric"]
+        )
+
+        assert test_result["group_names"] == ["B", "A"]
+        assert test_result["sample_sizes"] == {"B": 20, "A": 20}
+        assert test_result["group_means"] == [19.5, 29.5]
+
+    @pytest.mark.asyncio
+    async def test_skip_second_normality_check_when_first_fails(self, tester):
+        """Should not run Shapiro-Wilk on group2 once group1 is non-normal."""
+        from scipy import stats
+
+        skewed = np.exp(np.arange(30, dtype=float))
+        normal = np.random.default_rng(0).normal(100, 10, 30)
+
+        with patch("knowdb.intelligence.statistical.stats.shapiro", wraps=stats.shapiro) as shapiro:
+            test_result = await tester._two_group_test(skewed, normal, ["A", "B"])
+
+        assert shapiro.call_count == 1
+        assert test_result["test_type"] == "mann_whitney_u"
+        assert not test_result["assumptions"]["normality"]
+
 
 class TestStatisticalTesterMultipleGroupTests:
     """Tests for multiple-group statistical comparisons."""
@@ -614,6 +681,23 @@ class TestStatisticalTesterCorrelation:
         assert "pearson_r" in test_result
         assert test_result["pearson_r"] > 0.8  # Strong positive correlation
 
+    @pytest.mark.asyncio
+    async def test_correlation_missing_variable(self, tester):
+        """Should skip correlation when a variable is absent from the data."""
+        result = {
+            "data": [{"var1": float(i), "other": float(i)} for i in range(50)],
+            "metadata": {}
+        }
+
+        test_result = await tester.run_significance_tests(
+            result,
+            comparison_type="correlation",
+            dimensions=[],
+            measures=["var1", "var2"]
+        )
+
+        assert test_result is None
+
 
 class TestStatisticalTesterTrend:
     """Tests for trend analysis."""
@@ -667,6 +751,43 @@ class TestStatisticalTesterTrend:
         assert test_result["trend_direction"] == "decreasing"
         assert test_result["linear_slope"] < 0
 
+    @pytest.mark.asyncio
+    async def test_trend_missing_measure(self, tester):
+        """Should skip trend analysis when the measure is absent from the data."""
+        result = {
+            "data": [{"time": i, "other": i} for i in range(20)],
+            "metadata": {}
+        }
+
+        test_result = await tester.run_significance_tests(
+            result,
+            comparison_type="trend",
+            dimensions=["time"],
+            measures=["metric"]
+        )
+
+        assert test_result is None
+
+    @pytest.mark.asyncio
+    async def test_trend_with_decimal_measure(self, tester):
+        """Should test Decimal values as returned by DuckDB numeric aggregates."""
+        from decimal import Decimal
+
+        result = {
+            "data": [{"time": i, "metric": Decimal(i * 2) + Decimal("0.5")} for i in range(20)],
+            "metadata": {}
+        }
+
+        test_result = await tester.run_significance_tests(
+            result,
+            comparison_type="trend",
+            dimensions=["time"],
+            measures=["metric"]
+        )
+
+        assert test_result["trend_direction"] == "increasing"
+        assert test_result["linear_slope"] == pytest.approx(2.0)
+
 
 class TestStatisticalTesterEdgeCases:
     """Tests for edge cases and error handling."""
@@ -563,6 +563,17 @@ class TestSuggestAnalysis:
         # Suggestions should relate to the current analysis
         assert "suggestions" in result
 
+    def test_suggest_trend_only_without_temporal_dimension(self, semantic_tools):
+        """Test that the trend suggestion is skipped for time-based breakdowns."""
+        def questions(dimensions):
+            result = semantic_tools.suggest_analysis(
+                {"metric": "total_revenue", "dimensions": dimensions}
+            )
+            return [s.get("question", "") for s in result["suggestions"]]
+
+        assert any("trend" in q for q in questions(["region"]))
+        assert not any("trend" in q for q in questions(["region", "quarter"]))
+
     def test_suggest_analysis_no_context(self, semantic_tools):
         """Test suggest_analysis with no context."""
         result = semantic_tools.suggest_analysis(None)
@@ -191,6 +191,38 @@ class TestMCPServerInitialization:
         for required in required_tools:
             assert required in tool_names, f"Missing required tool: {required}"
 
+    def test_tool_list_built_once(self):
+        """Tool list is precomputed and reused across calls"""
+        from knowdb.mcp.server import get_tool_list
+        assert get_tool_list() is get_tool_list()
+
+    def test_warm_up_bounded_by_deadline(self):
+        """Warm-up runs inline with a deadline and leaves no thread behind"""
+        import threading
+        import time
+        from knowdb.mcp import server
+
+        manager = MagicMock()
+        threads_before = threading.active_count()
+
+        with patch.object(server, "_semantic_manager", manager):
+            started = time.monotonic()
+            server.warm_up_components(timeout=0.2)
+
+        deadline = manager.warm_up.call_args.kwargs["deadline"]
+        assert started < deadline <= started + 0.2 + 0.05
+        assert threading.active_count() == threads_before
+
+    def test_warm_up_failure_does_not_block_startup(self):
+        """Warm-up errors are logged, not raised"""
+        from knowdb.mcp import server
+
+        manager = MagicMock()
+        manager.warm_up.side_effect = RuntimeError("connection refused")
+
+        with patch.object(server, "_semantic_manager", manager):
+            server.warm_up_components(timeout=0.2)
+
 
 class TestExecutionFirstPattern:
     """Test execution-first pattern is enforced"""
@@ -531,6 +563,82 @@ class TestQueryCaching:
         assert result["result"]["cache_hit"] == False
 
 
+    @pytest.mark.asyncio
+    async def test_cache_write_failure_does_not_fail_query(
+        self,
+        mock_semantic_manager,
+        mock_intelligence_engine,
+        mock_statistical_tester,
+        mock_conversation_memory,
+        mock_query_optimizer
+    ):
+        """A failing cache write should be logged, not surfaced to the caller"""
+        from knowdb.mcp.tools import query_model_tool
+
+        mock_query_optimizer.get_cached_result = MagicMock(return_value=None)
+        mock_query_optimizer.cache_result = MagicMock(side_effect=RuntimeError("cache down"))
+
+        result = await query_model_tool(
+            model="users",
+            dimensions=["plan_type"],
+            measures=["total_users"],
+            filters={},
+            limit=None,
+            semantic_manager=mock_semantic_manager,
+            intelligence_engine=mock_intelligence_engine,
+            statistical_tester=mock_statistical_tester,
+            conversation_memory=mock_conversation_memory,
+            query_optimizer=mock_query_optimizer
+        )
+
+        assert "error" not in result
+        assert mock_query_optimizer.cache_result.called
+        assert result["result"]["cache_hit"] == False
+
+
+    @pytest.mark.asyncio
+    async def test_cache_write_awaited_when_analysis_fails(
+        self,
+        mock_semantic_manager,
+        mock_intelligence_engine,
+        mock_statistical_tester,
+        mock_conversation_memory,
+        mock_query_optimizer
+    ):
+        """The background cache write should finish even if a later step raises"""
+        import asyncio
+        import threading
+        from knowdb.mcp.tools import query_model_tool
+
+        # The cache write is still running when validation fails
+        release = threading.Event()
+
+        async def failing_validation(*args, **kwargs):
+            release.set()
+            raise ValueError("validation broke")
+
+        mock_query_optimizer.get_cached_result = MagicMock(return_value=None)
+        mock_query_optimizer.cache_result = MagicMock(side_effect=lambda *args: release.wait(5))
+        mock_statistical_tester.validate_result = AsyncMock(side_effect=failing_validation)
+
+        result = await query_model_tool(
+            model="users",
+            dimensions=["plan_type"],
+            measures=["total_users"],
+            filters={},
+            limit=None,
+            semantic_manager=mock_semantic_manager,
+            intelligence_engine=mock_intelligence_engine,
+            statistical_tester=mock_statistical_tester,
+            conversation_memory=mock_conversation_memory,
+            query_optimizer=mock_query_optimizer
+        )
+
+        assert "validation broke" in result["error"]
+        assert mock_query_optimizer.cache_result.called
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
 class TestErrorHandling:
     """Test error handling and graceful degradation"""
 
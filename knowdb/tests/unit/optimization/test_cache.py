@@ -18,7 +18,7 @@ import pytest
 import time
 import threading
 from collections import OrderedDict
-from datetime import datetime, timedelta
+from datetime import datetime
 from unittest.mock import Mock, patch, MagicMock
 from typing import Any, Dict, Optional
 
@@ -52,8 +52,8 @@ class TestCacheEntry:
         """Test creating a cache entry with required fields."""
         entry = CacheEntry(
             value={"data": [1, 2, 3]},
-            created_at=datetime.now(),
-            expires_at=datetime.now() + timedelta(hours=1),
+            created_at=time.time(),
+            expires_at=time.time() + 3600,
             key="test_key",
             access_count=0,
         )
@@ -65,8 +65,8 @@ class TestCacheEntry:
         """Test that entry is not expired when within TTL."""
         entry = CacheEntry(
             value="test",
-            created_at=datetime.now(),
-            expires_at=datetime.now() + timedelta(hours=1),
+            created_at=time.time(),
+            expires_at=time.time() + 3600,
             key="test",
             access_count=0,
         )
@@ -76,24 +76,49 @@ class TestCacheEntry:
         """Test that entry is expired when past TTL."""
         entry = CacheEntry(
             value="test",
-            created_at=datetime.now() - timedelta(hours=2),
-            expires_at=datetime.now() - timedelta(hours=1),
+            created_at=time.time() - 7200,
+            expires_at=time.time() - 3600,
             key="test",
             access_count=0,
         )
         assert entry.is_expired is True
 
+    def test_cache_entry_expiry_follows_expires_at(self):
+        """Test that expiry reads expires_at, so reassigning it takes effect."""
+        entry = CacheEntry(
+            value="test",
+            created_at=time.time(),
+            expires_at=time.time() + 30,
+            key="test",
+        )
+        assert entry.is_expired is False
+
+        entry.expires_at = time.time() - 1
+        assert entry.is_expired is True
+
+    def test_cache_entry_has_no_instance_dict(self):
+        """Test that cache entries are slotted to keep per-entry overhead low."""
+        entry = CacheEntry(
+            value="test",
+            created_at=time.time(),
+            expires_at=time.time() + 3600,
+            key="test",
+        )
+        assert not hasattr(entry, "__dict__")
+
     def test_cache_entry_serialization(self):
         """Test converting entry to dict and back."""
         original = CacheEntry(
             value={"result": "data"},
-            created_at=datetime.now(),
-            expires_at=datetime.now() + timedelta(hours=1),
+            created_at=time.time(),
+            expires_at=time.time() + 3600,
             key="serialize_test",
             access_count=5,
         )
         serialized = original.to_dict()
         restored = CacheEntry.from_dict(serialized)
+        assert serialized["expires_at"] == datetime.fromtimestamp(original.expires_at).isoformat()
+        assert restored.expires_at == pytest.approx(original.expires_at)
         assert restored.value == original.value
         assert restored.key == original.key
         assert restored.access_count == original.access_count
@@ -149,6 +174,13 @@ class TestQueryCacheBasicOperations:
         result = cache.get("query1")
         assert result == {"result": "data"}
 
+    def test_cache_hit_returns_stored_object(self):
+        """Test that hits return the cached object without copying."""
+        cache = QueryCache()
+        value = {"data": [{"id": 1}]}
+        cache.set("query1", value)
+        assert cache.get("query1") is value
+
     def test_cache_miss_returns_none(self):
         """Test that cache miss returns None."""
         cache = QueryCache()
@@ -187,6 +219,25 @@ class TestQueryCacheBasicOperations:
         assert cache.get("key1") is None
         assert cache.get("key2") is None
 
+    def test_set_many_and_get_many(self):
+        """Test batched set and get keep per-item params and order."""
+        cache = QueryCache()
+        cache.set_many([
+            ("SELECT 1", "one", None),
+            ("SELECT 2", "two", {"limit": 5}),
+        ])
+
+        results = cache.get_many([
+            ("SELECT 2", {"limit": 5}),
+            ("SELECT 1", None),
+            ("SELECT 2", None),
+        ])
+
+        assert results == ["two", "one", None]
+        metrics = cache.get_metrics()
+        assert metrics.hits == 2
+        assert metrics.misses == 1
+
 
 class TestCacheKeyGeneration:
     """Test cache key generation from query parameters."""
@@ -226,6 +277,29 @@ class TestCacheKeyGeneration:
         keys = [cache._generate_key("SELECT 1") for _ in range(10)]
         assert len(set(keys)) == 1
 
+    def test_missing_and_empty_params_share_key(self):
+        """Test that None and {} params map to the same key."""
+        cache = QueryCache()
+        assert cache._generate_key("SELECT 1") == cache._generate_key("SELECT 1", {})
+
+    def test_repeated_query_hash_is_memoized(self):
+        """Test that hashing the same query again reuses the memoized digest."""
+        from optimization.cache import _hash_query
+
+        cache = QueryCache()
+        query = "SELECT memo FROM t WHERE x = 1"
+        cache._generate_key(query)
+        hits_before = _hash_query.cache_info().hits
+        cache._generate_key(query)
+        assert _hash_query.cache_info().hits == hits_before + 1
+
+    def test_key_is_128_bit_hex_digest(self):
+        """Test that keys keep the 32-hex-character width of the old sliced digest."""
+        cache = QueryCache()
+        key = cache._generate_key("SELECT 1", {"limit": 10})
+        assert len(key) == 32
+        int(key, 16)
+
 
 class TestLRUEviction:
     """Test LRU eviction behavior."""
@@ -363,6 +437,17 @@ class TestCacheMetrics:
 
         assert cache.hit_rate == 0.5  # 2 hits / 4 total
 
+    def test_metrics_disabled_leaves_counters_untouched(self):
+        """Test that lookups skip all metric updates when metrics are disabled."""
+        cache = QueryCache(CacheConfig(enable_metrics=False))
+        cache.set("key1", "value1")
+
+        assert cache.get("key1") == "value1"
+        assert cache.get("missing") is None
+
+        metrics = cache.get_metrics()
+        assert (metrics.hits, metrics.misses, metrics.total_queries) == (0, 0, 0)
+
     def test_hit_rate_zero_queries(self):
         """Test hit rate is 0 when no queries made."""
         cache = QueryCache()
@@ -565,6 +650,147 @@ class TestCachedQueryDecorator:
         metrics = cache.get_metrics()
         assert metrics.misses >= 1
 
+    def test_decorator_single_flight_concurrent_misses(self):
+        """Test that concurrent misses on one query run the function once."""
+        cache = QueryCache()
+        call_count = 0
+        started = threading.Event()
+        release = threading.Event()
+
+        @cached_query(cache)
+        def slow_query(query: str) -> dict:
+            nonlocal call_count
+            call_count += 1
+            started.set()
+            release.wait(timeout=5)
+            return {"result": "data"}
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(slow_query("SELECT 1")))
+        leader.start()
+        assert started.wait(timeout=5)
+
+        followers = [
+            threading.Thread(target=lambda: results.append(slow_query("SELECT 1")))
+            for _ in range(4)
+        ]
+        for t in followers:
+            t.start()
+        time.sleep(0.1)
+        release.set()
+        for t in [leader] + followers:
+            t.join(timeout=5)
+
+        assert call_count == 1
+        assert results == [{"result": "data"}] * 5
+
+    def test_decorator_single_flight_leader_failure(self):
+        """Test that a failed computation does not leave the query stuck in flight."""
+        cache = QueryCache()
+        calls = []
+
+        @cached_query(cache)
+        def flaky_query(query: str) -> str:
+            calls.append(query)
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+            return "ok"
+
+        with pytest.raises(RuntimeError):
+            flaky_query("SELECT 1")
+        assert flaky_query("SELECT 1") == "ok"
+        assert len(calls) == 2
+
+    def test_decorator_single_flight_retries_once_after_leader_failure(self):
+        """Test that waiters on a failed leader recompute once, not each."""
+        cache = QueryCache()
+        calls = []
+        started = threading.Event()
+        release = threading.Event()
+
+        @cached_query(cache)
+        def flaky_query(query: str) -> str:
+            calls.append(query)
+            if len(calls) == 1:
+                started.set()
+                release.wait(timeout=5)
+                raise RuntimeError("boom")
+            time.sleep(0.05)
+            return "ok"
+
+        def call_leader():
+            with pytest.raises(RuntimeError):
+                flaky_query("SELECT 1")
+
+        results = []
+        leader = threading.Thread(target=call_leader)
+        leader.start()
+        assert started.wait(timeout=5)
+        followers = [
+            threading.Thread(target=lambda: results.append(flaky_query("SELECT 1")))
+            for _ in range(4)
+        ]
+        for t in followers:
+            t.start()
+        time.sleep(0.1)
+        release.set()
+        for t in [leader] + followers:
+            t.join(timeout=5)
+
+        assert len(calls) == 2
+        assert results == ["ok"] * 4
+
+    def test_decorator_single_flight_wait_is_bounded(self):
+        """Test that a hung computation doesn't block other callers forever."""
+        cache = QueryCache()
+        started = threading.Event()
+        release = threading.Event()
+
+        @cached_query(cache, wait_timeout=0.1)
+        def slow_query(query: str) -> str:
+            if not started.is_set():
+                started.set()
+                release.wait(timeout=5)
+                return "slow"
+            return "fast"
+
+        leader = threading.Thread(target=slow_query, args=("SELECT 1",))
+        leader.start()
+        assert started.wait(timeout=5)
+
+        try:
+            assert slow_query("SELECT 1") == "fast"
+        finally:
+            release.set()
+            leader.join(timeout=5)
+
+    def test_decorator_single_flight_counts_each_call_once(self):
+        """Test that waiting callers are not counted twice in cache metrics."""
+        cache = QueryCache()
+        started = threading.Event()
+        release = threading.Event()
+
+        @cached_query(cache)
+        def slow_query(query: str) -> str:
+            started.set()
+            release.wait(timeout=5)
+            return "data"
+
+        threads = [threading.Thread(target=slow_query, args=("SELECT 1",))]
+        threads[0].start()
+        assert started.wait(timeout=5)
+        threads += [threading.Thread(target=slow_query, args=("SELECT 1",)) for _ in range(3)]
+        for t in threads[1:]:
+            t.start()
+        time.sleep(0.1)
+        release.set()
+        for t in threads:
+            t.join(timeout=5)
+
+        metrics = cache.get_metrics()
+        assert metrics.total_queries == 4
+        assert metrics.misses == 4
+
 
 class TestQueryOptimizer:
     """Test QueryOptimizer for complexity analysis."""
@@ -622,6 +848,98 @@ class TestQueryOptimizer:
 
         assert suggestion.should_cache is False or suggestion.ttl_recommendation < 60
 
+    def test_each_volatile_pattern_disables_caching(self):
+        """Test every volatile pattern is caught by the combined matcher."""
+        optimizer = QueryOptimizer()
+        queries = [
+            "SELECT now() AS ts",
+            "SELECT * FROM t WHERE d = current_date",
+            "SELECT random() FROM t",
+            "SELECT * FROM live_feed JOIN live ON 1 = 1",
+        ]
+
+        for query in queries:
+            assert optimizer.suggest_cache_strategy(query).should_cache is False, query
+        assert optimizer.suggest_cache_strategy("SELECT * FROM delivery").should_cache is True
+
+    def test_cache_key_ignores_dimension_order(self):
+        """Test semantically identical queries share a cache key."""
+        optimizer = QueryOptimizer()
+        key1 = optimizer.generate_cache_key({
+            "model": "users",
+            "dimensions": ["plan_type", "industry"],
+            "measures": ["total_users"],
+            "filters": {"status": "active"},
+        })
+        key2 = optimizer.generate_cache_key({
+            "model": "users",
+            "dimensions": ["industry", "plan_type"],
+            "measures": ["total_users"],
+            "filters": {"status": "active"},
+        })
+
+        assert key1 == key2
+
+    def test_cache_key_keeps_filter_values(self):
+        """Test filter values are hashed verbatim, so distinct values never collide."""
+        optimizer = QueryOptimizer()
+        base = {"model": "users", "dimensions": ["city"], "measures": ["total_users"]}
+
+        def key(filters):
+            return optimizer.generate_cache_key({**base, "filters": filters})
+
+        assert key({"city": "New  York"}) != key({"city": "New York"})
+        assert key({"status": "  active "}) != key({"status": "active"})
+        assert key({"name": "Alice"}) != key({"name": "alice"})
+
+    def test_cache_key_sorts_list_filters(self):
+        """Test list filters, including dicts, are order-insensitive."""
+        optimizer = QueryOptimizer()
+        base = {"model": "users", "dimensions": ["city"], "measures": ["total_users"]}
+        filters = [{"field": "city", "value": "Paris"}, {"field": "plan", "value": "pro"}]
+
+        key1 = optimizer.generate_cache_key({**base, "filters": filters})
+        key2 = optimizer.generate_cache_key({**base, "filters": filters[::-1]})
+
+        assert key1 == key2
+
+    def test_cache_key_distinguishes_queries(self):
+        """Test different queries get different cache keys."""
+        optimizer = QueryOptimizer()
+        base = {"model": "users", "dimensions": ["plan_type"], "measures": ["total_users"]}
+
+        assert optimizer.generate_cache_key(base) != optimizer.generate_cache_key(
+            {**base, "limit": 10}
+        )
+        assert optimizer.generate_cache_key(base) != optimizer.generate_cache_key(
+            {**base, "model": "events"}
+        )
+
+    def test_cache_key_from_sql_only(self):
+        """Test SQL-only query info normalizes whitespace and case."""
+        optimizer = QueryOptimizer()
+        key1 = optimizer.generate_cache_key({"sql": "SELECT * FROM users"})
+        key2 = optimizer.generate_cache_key({"sql": "select  *\nfrom users"})
+
+        assert key1 == key2
+
+    def test_cache_key_from_sql_keeps_literals(self):
+        """Test quoted SQL literals keep their case and spacing in the key."""
+        optimizer = QueryOptimizer()
+
+        def key(sql):
+            return optimizer.generate_cache_key({"sql": sql})
+
+        assert key("SELECT * FROM users WHERE name = 'Alice'") != key(
+            "SELECT * FROM users WHERE name = 'alice'"
+        )
+        assert key("SELECT * FROM users WHERE city = 'New  York'") != key(
+            "select * from users where city = 'New York'"
+        )
+        assert key("SELECT * FROM users WHERE name = 'O''Brien'") == key(
+            "select  * from users where name = 'O''Brien'"
+        )
+
     def test_index_suggestions(self):
         """Test optimizer suggests indexes."""
         optimizer = QueryOptimizer()
@@ -99,6 +99,54 @@ def manager(config_file):
     return SemanticLayerManager(config_path=config_file)
 
 
+DB_EXTRA_METRICS_YAML = """
+    - name: "order_count"
+      display_name: "Order Count"
+      description: "Number of orders"
+      type: "simple"
+      calculation:
+        table: "orders"
+        aggregation: "count"
+        column: "order_id"
+
+  canonical_datasets:
+    - name: "revenue_overview"
+      display_name: "Revenue Overview"
+      metrics: ["total_revenue", "order_count"]
+      dimensions: ["customer_segment"]
+"""
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """Create a SemanticLayerManager backed by a small DuckDB database."""
+    import duckdb
+
+    db_file = tmp_path / "test.duckdb"
+    conn = duckdb.connect(str(db_file))
+    conn.execute(
+        "CREATE TABLE customers AS SELECT * FROM (VALUES "
+        "(1, 'SMB', DATE '2024-01-05'), "
+        "(2, 'SMB', DATE '2024-02-01'), "
+        "(3, 'Enterprise', DATE '2024-02-10')"
+        ") AS t(customer_id, segment, signup_date)"
+    )
+    conn.execute(
+        "CREATE TABLE orders AS SELECT * FROM (VALUES "
+        "(1, 1, 100.0), (2, 1, 50.0), (3, 3, 300.0)"
+        ") AS t(order_id, customer_id, amount)"
+    )
+    conn.close()
+
+    config_path = tmp_path / "metrics.yml"
+    config_path.write_text(
+        SAMPLE_CONFIG_YAML.replace('":memory:"', f'"{db_file}"') + DB_EXTRA_METRICS_YAML
+    )
+    manager = SemanticLayerManager(config_path=str(config_path))
+    yield manager
+    manager.close()
+
+
 class TestSemanticLayerManagerInit:
     """Tests for SemanticLayerManager initialization."""
 
@@ -135,6 +183,47 @@ class TestSemanticLayerManagerInit:
         assert "customer_segment" in dim_names
         assert "signup_month" in dim_names
 
+    def test_init_loads_canonical_datasets(self, tmp_path):
+        """Manager should expose canonical datasets as an immutable tuple."""
+        config_path = tmp_path / "metrics.yml"
+        config_path.write_text(
+            SAMPLE_CONFIG_YAML
+            + """
+  canonical_datasets:
+    - name: "customer_overview"
+      display_name: "Customer Overview"
+      metrics: ["total_customers", "total_revenue"]
+      dimensions: ["customer_segment"]
+"""
+        )
+
+        manager = SemanticLayerManager(config_path=str(config_path))
+
+        assert isinstance(manager.canonical_datasets, tuple)
+        assert len(manager.canonical_datasets) == 1
+        dataset = manager.canonical_datasets[0]
+        assert dataset.display_name == "Customer Overview"
+        assert dataset.metrics == ["total_customers", "total_revenue"]
+
+    def test_init_with_invalid_canonical_dataset(self, tmp_path):
+        """A malformed canonical dataset should raise SemanticLayerError naming it."""
+        config_path = tmp_path / "metrics.yml"
+        config_path.write_text(
+            SAMPLE_CONFIG_YAML
+            + """
+  canonical_datasets:
+    - name: "broken_overview"
+      metrics: "total_customers"
+"""
+        )
+
+        with pytest.raises(SemanticLayerError, match="broken_overview"):
+            SemanticLayerManager(config_path=str(config_path))
+
+    def test_init_without_canonical_datasets(self, manager):
+        """Canonical datasets should default to an empty tuple."""
+        assert manager.canonical_datasets == ()
+
 
 class TestMetricOperations:
     """Tests for metric-related operations."""
@@ -164,6 +253,14 @@ class TestMetricOperations:
             manager.get_metric("nonexistent_metric")
         assert "not found" in str(excinfo.value).lower()
 
+    def test_get_metric_not_found_lists_available(self, manager):
+        """The error for an unknown metric should name every available metric."""
+        for _ in range(2):
+            with pytest.raises(SemanticLayerError) as excinfo:
+                manager.get_metric("nonexistent_metric")
+            for metric in manager.list_metrics():
+                assert metric["name"] in str(excinfo.value)
+
     def test_explain_metric_simple(self, manager):
         """explain_metric should return explanation for simple metric."""
         explanation = manager.explain_metric("total_customers")
@@ -214,6 +311,28 @@ class TestDimensionOperations:
         assert "sql" in dim
         assert "strftime" in dim["sql"]
 
+    def test_temporal_dimensions_config_loaded(self, tmp_path):
+        """date_dimensions_config.yaml beside the models directory should add dimensions."""
+        config_dir = tmp_path / "semantic" / "models"
+        config_dir.mkdir(parents=True)
+        config_path = config_dir / "models.yml"
+        config_path.write_text(SAMPLE_CONFIG_YAML)
+        (tmp_path / "semantic" / "date_dimensions_config.yaml").write_text(
+            "temporal_dimensions:\n"
+            "  - name: signup_week\n"
+            "    table: customers\n"
+            "    type: temporal\n"
+            "  - name: signup_month\n"
+            "    table: customers\n"
+            "    type: temporal\n"
+        )
+
+        temporal_manager = SemanticLayerManager(config_path=str(config_path))
+
+        assert temporal_manager.get_dimension("signup_week")["type"] == "temporal"
+        names = [d["name"] for d in temporal_manager.list_dimensions()]
+        assert names.count("signup_month") == 1
+
 
 class TestQueryExecution:
     """Tests for query execution."""
@@ -234,6 +353,21 @@ class TestQueryExecution:
             assert "row_count" in result
             assert "timestamp" in result
 
+    def test_query_metric_empty_result(self, manager):
+        """Empty query results should return no data rows."""
+        with patch.object(manager, '_query_simple_metric') as mock_query:
+            import pandas as pd
+            mock_query.return_value = (
+                pd.DataFrame({"total_customers": []}),
+                "SELECT COUNT(*)"
+            )
+
+            result = manager.query_metric("total_customers")
+
+            assert result["data"] == []
+            assert result["row_count"] == 0
+            assert result["sql"] == "SELECT COUNT(*)"
+
     def test_query_metric_with_dimensions(self, manager):
         """query_metric should support dimensional grouping."""
         with patch.object(manager, '_query_simple_metric') as mock_query:
@@ -311,6 +445,210 @@ class TestQueryExecution:
             # Result should be ordered
             assert result["data"][0]["total_customers"] >= result["data"][1]["total_customers"]
 
+    def test_dimension_join_projects_used_columns(self, db_manager):
+        """Only the join key and the dimension's column should enter the join."""
+        result = db_manager.query_metric("total_revenue", dimensions=["customer_segment"])
+
+        assert "signup_date" not in str(result["sql"])
+        revenue = {row["customer_segment"]: float(row["total_revenue"]) for row in result["data"]}
+        assert revenue == {"Enterprise": 300.0, "SMB": 150.0}
+
+    def test_dimensions_from_one_table_join_once(self, db_manager):
+        """Several dimensions from the same table should share a single join."""
+        result = db_manager.query_metric(
+            "total_revenue",
+            dimensions=["customer_segment", "signup_month"],
+            order_by="signup_month",
+        )
+
+        assert [row["signup_month"] for row in result["data"]] == ["2024-01", "2024-02"]
+        assert str(result["sql"]).count("JOIN") == 1
+
+    def test_declared_join_key(self, db_manager):
+        """A join_key on the dimension should be used, and validated."""
+        dim = db_manager.get_dimension("customer_segment")
+        with patch.dict(dim, {"join_key": "customer_id"}):
+            result = db_manager.query_metric("total_revenue", dimensions=["customer_segment"])
+            assert '"customer_id" =' in str(result["sql"])
+
+        with patch.dict(dim, {"join_key": "segment"}):
+            with pytest.raises(SemanticLayerError, match="Join key"):
+                db_manager.query_metric(
+                    "total_revenue", dimensions=["customer_segment"], use_cache=False
+                )
+
+    def test_missing_aggregate_returns_no_data(self, db_manager):
+        """An aggregate over no rows (NULL or NaN) should come back empty."""
+        import pandas as pd
+
+        result = db_manager.query_metric("total_revenue", filters=["amount > 1000"])
+        assert result["data"] == []
+        assert result["row_count"] == 0
+
+        metric = db_manager.get_metric("total_revenue")
+        nan_df = pd.DataFrame({"total_revenue": [float("nan")]})
+        result = db_manager._build_metric_result(metric, None, nan_df, "")
+        assert result["data"] == []
+        assert result["row_count"] == 0
+
+    def test_missing_aggregate_filtered_in_query(self, db_manager):
+        """The all-NULL aggregate row should be dropped by the warehouse itself."""
+        metric = db_manager.get_metric("total_revenue")
+        result_df, sql = db_manager._query_simple_metric(
+            metric, None, ["amount > 1000"], None, None
+        )
+        assert len(result_df) == 0
+        assert "IS NOT NULL" in str(sql)
+
+        result = db_manager.query_metric("arpu", filters=["amount > 1000"])
+        assert result["data"] == []
+
+    @pytest.mark.parametrize("table_name, filter_expr, expected_rows", [
+        ("customers", "segment = 'SMB'", 2),
+        ("customers", "segment != 'SMB'", 1),
+        ("orders", "order_id = 2", 1),
+        ("orders", "amount >= 100", 2),
+        ("orders", "amount <= 100", 2),
+        ("orders", "amount > 100", 1),
+        ("orders", "amount < 100", 1),
+        ("orders", "missing_column = 1", 3),
+    ])
+    def test_apply_filter_forms(self, db_manager, table_name, filter_expr, expected_rows):
+        """Each supported filter form should apply; unknown columns are ignored."""
+        table = db_manager.connection.table(table_name)
+        filtered = db_manager._apply_filter(table, filter_expr)
+        assert filtered.count().execute() == expected_rows
+
+
+class TestBatchedQueries:
+    """Tests for querying several metrics at once."""
+
+    def test_query_metrics_batches_same_table(self, db_manager):
+        """Metrics on the same table should share a single query."""
+        result = db_manager.query_metrics(["total_revenue", "order_count"])
+
+        revenue = result["results"]["total_revenue"]
+        orders = result["results"]["order_count"]
+        assert revenue["data"][0]["total_revenue"] == 450.0
+        assert orders["data"][0]["order_count"] == 3
+        assert revenue["sql"] == orders["sql"]
+
+    def test_query_metrics_with_dimensions(self, db_manager):
+        """Batched results should be split per metric by dimension."""
+        result = db_manager.query_metrics(
+            ["total_revenue", "order_count"],
+            dimensions=["customer_segment"],
+            order_by="customer_segment",
+        )
+
+        revenue = result["results"]["total_revenue"]["data"]
+        assert revenue == [
+            {"customer_segment": "Enterprise", "total_revenue": 300.0},
+            {"customer_segment": "SMB", "total_revenue": 150.0},
+        ]
+        assert "order_count" not in revenue[0]
+
+    def test_query_metrics_falls_back_for_other_tables(self, db_manager):
+        """Metrics on different tables should be queried separately."""
+        result = db_manager.query_metrics(["total_customers", "total_revenue"])
+
+        assert result["results"]["total_customers"]["data"][0]["total_customers"] == 3
+        assert result["results"]["total_revenue"]["data"][0]["total_revenue"] == 450.0
+
+    def test_query_canonical_dataset(self, db_manager):
+        """Canonical datasets should query all of their metrics."""
+        result = db_manager.query_canonical_dataset("revenue_overview")
+
+        assert result["display_name"] == "Revenue Overview"
+        assert set(result["results"]) == {"total_revenue", "order_count"}
+        assert result["results"]["order_count"]["row_count"] == 2
+
+    def test_query_metric_preview_rows(self, db_manager):
+        """Previews should fetch fewer rows but report the full count."""
+        result = db_manager.query_metric(
+            "total_revenue",
+            dimensions=["customer_segment"],
+            order_by="customer_segment",
+            preview_rows=1,
+        )
+
+        assert result["data"] == [{"customer_segment": "Enterprise", "total_revenue": 300.0}]
+        assert result["row_count"] == 1
+        assert result["total_row_count"] == 2
+
+    def test_short_preview_skips_count_query(self, db_manager, monkeypatch):
+        """A preview that returns every row should not issue a COUNT query."""
+        def fail_count(*args, **kwargs):
+            raise AssertionError("count query should be skipped")
+
+        monkeypatch.setattr(db_manager, "_count_simple_metric_rows", fail_count)
+        result = db_manager.query_metric(
+            "total_revenue", dimensions=["customer_segment"], preview_rows=5
+        )
+
+        assert result["row_count"] == 2
+        assert result["total_row_count"] == 2
+
+    def test_query_metric_preview_larger_than_limit(self, db_manager):
+        """A preview larger than the limit should leave the query unchanged."""
+        result = db_manager.query_metric(
+            "total_revenue", dimensions=["customer_segment"], limit=1, preview_rows=5
+        )
+
+        assert result["row_count"] == 1
+        assert "total_row_count" not in result
+
+    def test_query_canonical_dataset_preview(self, db_manager):
+        """Canonical dataset previews should apply to batched metrics."""
+        result = db_manager.query_canonical_dataset("revenue_overview", preview_rows=1)
+
+        for metric_result in result["results"].values():
+            assert metric_result["row_count"] == 1
+            assert metric_result["total_row_count"] == 2
+
+    def test_get_canonical_dataset(self, db_manager):
+        """Canonical datasets should be retrievable by name."""
+        dataset = db_manager.get_canonical_dataset("revenue_overview")
+        assert dataset is db_manager.canonical_datasets[0]
+        assert db_manager.get_canonical_dataset("missing") is None
+
+    def test_query_canonical_dataset_not_found(self, db_manager):
+        """Unknown canonical datasets should raise SemanticLayerError."""
+        with pytest.raises(SemanticLayerError) as excinfo:
+            db_manager.query_canonical_dataset("missing")
+        assert "revenue_overview" in str(excinfo.value)
+
+
+class TestDimensionValues:
+    """Tests for distinct dimension value lookups."""
+
+    def test_get_dimension_values(self, db_manager):
+        """Distinct values should be returned for a dimension."""
+        values = db_manager.get_dimension_values("customer_segment")
+        assert sorted(values) == ["Enterprise", "SMB"]
+
+    def test_get_temporal_dimension_values(self, db_manager):
+        """Temporal dimensions should resolve their SQL expression."""
+        values = db_manager.get_dimension_values("signup_month")
+        assert sorted(values) == ["2024-01", "2024-02"]
+
+    def test_dimension_values_cached(self, db_manager):
+        """Repeated lookups should be served from the cache."""
+        values = db_manager.get_dimension_values("customer_segment")
+        with patch.object(db_manager.connection, "table") as mock_table:
+            assert db_manager.get_dimension_values("customer_segment") is values
+            mock_table.assert_not_called()
+
+    def test_dimension_values_expire(self, db_manager):
+        """Cached values should be refreshed after their TTL."""
+        values = db_manager.get_dimension_values("customer_segment", ttl=0)
+        assert db_manager.get_dimension_values("customer_segment") is not values
+
+    def test_unknown_dimension_values(self, db_manager):
+        """Unknown dimensions should raise SemanticLayerError."""
+        with pytest.raises(SemanticLayerError):
+            db_manager.get_dimension_values("missing")
+
 
 class TestDerivedMetrics:
     """Tests for derived metric calculation."""
@@ -328,6 +666,139 @@ class TestDerivedMetrics:
 
             assert "arpu" in result["data"][0]
 
+    def test_derived_metric_values(self, db_manager):
+        """Derived metrics should evaluate their formula per dimension row."""
+        result = db_manager.query_metric(
+            "arpu", dimensions=["customer_segment"], order_by="customer_segment"
+        )
+
+        arpu = {row["customer_segment"]: float(row["arpu"]) for row in result["data"]}
+        assert arpu == {"Enterprise": 300.0, "SMB": 75.0}
+
+    def test_derived_formula_evaluated_over_columns(self, db_manager):
+        """Derived formulas should evaluate once over whole columns, not per row."""
+        import numpy as np
+        import knowdb.semantic_layer.manager as manager_module
+
+        with patch.object(
+            manager_module, "_evaluate_formula", wraps=manager_module._evaluate_formula
+        ) as mock_evaluate:
+            result = db_manager.query_metric("arpu", dimensions=["customer_segment"])
+
+        namespaces = [call.args[1] for call in mock_evaluate.call_args_list]
+        assert all(isinstance(v, np.ndarray) for ns in namespaces for v in ns.values())
+        assert sorted(float(row["arpu"]) for row in result["data"]) == [75.0, 300.0]
+
+    def test_derived_formula_single_row_uses_scalars(self, db_manager):
+        """Without dimensions the formula should run on scalars, not arrays."""
+        import numpy as np
+        import knowdb.semantic_layer.manager as manager_module
+
+        with patch.object(
+            manager_module, "_evaluate_formula", wraps=manager_module._evaluate_formula
+        ) as mock_evaluate:
+            result = db_manager.query_metric("arpu")
+
+        namespace = mock_evaluate.call_args_list[0].args[1]
+        assert not any(isinstance(v, np.ndarray) for v in namespace.values())
+        assert float(result["data"][0]["arpu"]) == 150.0
+
+    def test_derived_formula_single_row_numeric_division_by_zero(self, db_manager):
+        """A dimensionless numeric x / 0 gives inf, as on NumPy scalars."""
+        import math
+
+        metric = dict(db_manager.get_metric("arpu"))
+        metric["calculation"] = {"formula": "1.0 / (total_customers - total_customers)"}
+
+        with pytest.warns(RuntimeWarning):
+            result_df, _ = db_manager._query_derived_metric(metric, None, None, None, None)
+
+        assert math.isinf(result_df["arpu"].iloc[0])
+
+    def test_derived_formula_division_by_zero(self, db_manager):
+        """Division by zero in a formula should still fail the query."""
+        metric = dict(db_manager.get_metric("arpu"))
+        metric["calculation"] = {"formula": "total_revenue / (total_customers - total_customers)"}
+
+        with pytest.raises(SemanticLayerError):
+            db_manager._query_derived_metric(metric, None, None, None, None)
+
+    def test_derived_components_on_one_table_share_a_query(self, db_manager):
+        """Components reading the same table should be aggregated in one query."""
+        metric = dict(db_manager.get_metric("arpu"))
+        metric["calculation"] = {"formula": "total_revenue / order_count"}
+
+        with patch.object(
+            db_manager, "_query_simple_metrics", wraps=db_manager._query_simple_metrics
+        ) as mock_query:
+            result_df, _ = db_manager._query_derived_metric(metric, None, None, None, None)
+
+        mock_query.assert_called_once()
+        assert float(result_df["arpu"].iloc[0]) == 150.0
+
+    def test_derived_formula_too_long(self, db_manager):
+        """Oversized formulas should be rejected before they are parsed."""
+        from knowdb.semantic_layer.manager import MAX_FORMULA_LENGTH, _parse_formula
+
+        metric = dict(db_manager.get_metric("arpu"))
+        metric["calculation"] = {"formula": "total_revenue + " * MAX_FORMULA_LENGTH + "1"}
+        _parse_formula.cache_clear()
+
+        with pytest.raises(SemanticLayerError, match="exceeds"):
+            db_manager._query_derived_metric(metric, None, None, None, None)
+        assert _parse_formula.cache_info().misses == 0
+
+    def test_derived_formula_parsed_once(self, db_manager):
+        """Repeated derived queries should reuse the parsed formula."""
+        from knowdb.semantic_layer.manager import _parse_formula
+
+        db_manager.query_metric("arpu")
+        misses = _parse_formula.cache_info().misses
+        db_manager.query_metric("arpu", dimensions=["customer_segment"])
+        assert _parse_formula.cache_info().misses == misses
+
+    def test_derived_formula_arithmetic(self, db_manager):
+        """Formulas may combine names, numbers, parentheses and unary minus."""
+        metric = dict(db_manager.get_metric("arpu"))
+        metric["calculation"] = {"formula": "-(total_revenue - 50) / 2 * total_customers + 1"}
+
+        result_df, _ = db_manager._query_derived_metric(metric, None, None, None, None)
+
+        assert float(result_df["arpu"].iloc[0]) == -599.0
+
+    def test_derived_formula_runs_as_bytecode(self):
+        """Parsed formulas are compiled, so long chains don't recurse per node."""
+        import sys
+        from knowdb.semantic_layer.manager import _evaluate_formula, _parse_formula
+
+        code, names = _parse_formula(" + ".join(["x"] * 300))
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(100)
+        try:
+            assert _evaluate_formula(code, {"x": 1}) == 300
+        finally:
+            sys.setrecursionlimit(limit)
+        assert names == ("x",)
+
+    @pytest.mark.parametrize("formula", [
+        "total_revenue.__class__",
+        "__import__('os')",
+        "total_revenue if total_customers else 0",
+        "total_revenue > total_customers",
+        "total_revenue ** 100",
+        "'text'",
+        "total_revenue /",
+    ])
+    def test_derived_formula_rejects_non_arithmetic(self, db_manager, formula):
+        """Anything beyond arithmetic on names and numbers should be refused up front."""
+        metric = dict(db_manager.get_metric("arpu"))
+        metric["calculation"] = {"formula": formula}
+
+        with patch.object(db_manager, "_query_simple_metrics") as mock_query:
+            with pytest.raises(SemanticLayerError):
+                db_manager._query_derived_metric(metric, None, None, None, None)
+            mock_query.assert_not_called()
+
 
 class TestConnectionTypes:
     """Tests for different database connection types."""
@@ -337,11 +808,53 @@ class TestConnectionTypes:
         manager = SemanticLayerManager(config_path=config_file)
         assert manager.connection is not None
 
+    def test_warm_up_reports_failed_metrics(self, manager):
+        """Warm-up should not raise when metric tables are missing."""
+        warmed = manager.warm_up()
+
+        assert set(warmed) == {"total_customers", "total_revenue", "arpu"}
+        assert not any(warmed.values())
+
+    def test_warm_up_without_metric_queries(self, manager):
+        """Warm-up can be limited to the connection check."""
+        assert manager.warm_up(query_metrics=False) == {}
+
+    def test_warm_up_skips_metrics_after_deadline(self, manager):
+        """Metrics not reached before the deadline are skipped."""
+        with patch.object(manager, "query_metric") as mock_query, \
+                patch("knowdb.semantic_layer.manager.time.monotonic", side_effect=[0.0, 5.0]):
+            warmed = manager.warm_up(deadline=1.0)
+
+        assert warmed == {"total_customers": True}
+        mock_query.assert_called_once_with("total_customers", limit=1)
+
+    def test_warm_up_only_queries_metrics(self, manager):
+        """Warm-up doesn't scan dimension values."""
+        with patch.object(manager, "query_metric"), \
+                patch.object(manager, "get_dimension_values") as mock_values:
+            manager.warm_up()
+
+        mock_values.assert_not_called()
+
     def test_connection_close(self, manager):
         """Manager should close connection properly."""
         manager.close()
         # After closing, operations should fail or be unavailable
 
+    def test_connection_close_idempotent(self, manager):
+        """Closing twice (e.g. explicitly and at exit) should be safe."""
+        with patch.object(manager.connection, "disconnect") as mock_disconnect:
+            manager.close()
+            manager.close()
+        mock_disconnect.assert_called_once()
+
+    def test_connection_reused_across_queries(self, db_manager):
+        """Queries should share the manager's single connection."""
+        connection = db_manager.connection
+        db_manager.query_metric("total_revenue")
+        db_manager.query_metric("total_customers")
+        assert db_manager.connection is connection
+
 
 class TestEnvironmentVariables:
     """Tests for environment variable support."""
@@ -384,6 +897,88 @@ class TestCaching:
         manager.clear_cache()
         assert len(manager._cache) == 0
 
+    def test_list_metrics_cached(self, manager):
+        """Metric listings should be built once until the cache is cleared."""
+        metrics = manager.list_metrics()
+        assert manager.list_metrics() is metrics
+
+        manager.clear_cache()
+        assert manager.list_metrics() is not metrics
+        assert manager.list_metrics() == metrics
+
+    def test_list_dimensions_cached(self, manager):
+        """Dimension listings should be built once until the cache is cleared."""
+        dimensions = manager.list_dimensions()
+        assert manager.list_dimensions() is dimensions
+
+        manager.clear_cache()
+        assert manager.list_dimensions() is not dimensions
+
+    def test_query_results_cached(self, db_manager):
+        """Repeated queries should be served without re-running the query."""
+        first = db_manager.query_metric("total_revenue", dimensions=["customer_segment"])
+        with patch.object(db_manager, "_query_simple_metric") as mock_query:
+            second = db_manager.query_metric("total_revenue", dimensions=["customer_segment"])
+            mock_query.assert_not_called()
+        assert second["data"] == first["data"]
+        assert second is not first
+
+    def test_query_cache_isolated_from_callers(self, db_manager):
+        """Changing a returned result should not change what the cache serves."""
+        first = db_manager.query_metric("total_revenue", dimensions=["customer_segment"])
+        expected = [dict(row) for row in first["data"]]
+        first["data"][0]["total_revenue"] = -1
+        first["data"].clear()
+
+        second = db_manager.query_metric("total_revenue", dimensions=["customer_segment"])
+        second["data"].append({"customer_segment": "Other"})
+
+        third = db_manager.query_metric("total_revenue", dimensions=["customer_segment"])
+        assert third["data"] == expected
+
+    def test_query_cache_ignores_filter_order(self, db_manager):
+        """Filters are ANDed, so their order should not split the cache."""
+        filters = ["customer_segment = 'SMB'", "total_revenue > 0"]
+        db_manager.query_metric("total_revenue", filters=filters)
+        with patch.object(db_manager, "_query_simple_metric") as mock_query:
+            db_manager.query_metric("total_revenue", filters=filters[::-1])
+            mock_query.assert_not_called()
+
+    def test_query_cache_bypass_and_clear(self, db_manager):
+        """use_cache=False and clear_cache() should both force a fresh query."""
+        db_manager.query_metric("total_revenue")
+        with patch.object(
+            db_manager, "_query_simple_metric", wraps=db_manager._query_simple_metric
+        ) as mock_query:
+            db_manager.query_metric("total_revenue", use_cache=False)
+            db_manager.clear_cache()
+            db_manager.query_metric("total_revenue")
+        assert mock_query.call_count == 2
+
+    def test_tables_looked_up_once(self, db_manager):
+        """Ibis tables should be fetched once per name and reset by clear_cache()."""
+        with patch.object(
+            db_manager.connection, "table", wraps=db_manager.connection.table
+        ) as mock_table:
+            for _ in range(2):
+                db_manager.query_metric(
+                    "total_revenue", dimensions=["customer_segment"], use_cache=False
+                )
+            assert sorted(call.args[0] for call in mock_table.call_args_list) == [
+                "customers", "orders"
+            ]
+
+            db_manager.clear_cache()
+            db_manager.query_metric("total_revenue")
+            assert mock_table.call_count == 3
+
+    def test_query_cache_bounded(self, db_manager, monkeypatch):
+        """The result cache should evict least recently used entries."""
+        monkeypatch.setattr("knowdb.semantic_layer.manager.QUERY_RESULT_CACHE_SIZE", 2)
+        for limit in (1, 2, 3):
+            db_manager.query_metric("total_revenue", limit=limit)
+        assert [key[3] for key in db_manager._cache] == [2, 3]
+
 
 class TestValidation:
     """Tests for configuration validation."""